@@ -8,9 +8,10 @@ import asyncio
 
 # Import your models and Base
 from app.db.base import Base
-from app.auth.models import User
+from app.auth.models import User, ApiKey
 from app.medicaments.models import Medicament
 from app.models.import_log import ImportLog
+from app.models.data_version import DataVersion
 from app.core.config import settings
 
 # this is the Alembic Config object
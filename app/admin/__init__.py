@@ -0,0 +1 @@
+"""Administration and monitoring modules."""
@@ -0,0 +1,42 @@
+"""Administration routes (runtime metrics)."""
+from fastapi import APIRouter, Depends
+
+from app.auth.schemas import Principal
+from app.core.cache import response_cache
+from app.core.principal_cache import principal_cache
+from app.core.token_cache import token_cache
+from app.auth.api_keys import api_key_cache, unknown_api_key_cache
+from app.core.rate_limit import rate_limiter
+from app.db.pool import pool_stats
+from app.db.statement_cache import statement_cache_metrics
+from app.db.session import engine, read_engine
+from app.core.security import get_current_admin
+
+router = APIRouter(prefix="/admin", tags=["Administration"])
+
+
+@router.get("/metrics")
+async def get_metrics(
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    Get in-process runtime metrics of this worker.
+    
+    Requires Admin role.
+    
+    Returns:
+        dict: Metrics grouped by component
+    """
+    return {
+        "response_cache": response_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "api_key_cache": api_key_cache.stats(),
+        "unknown_api_key_cache": unknown_api_key_cache.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "db_pool": {
+            "write": pool_stats(engine),
+            "read": pool_stats(read_engine) if read_engine is not engine else None
+        },
+        "statement_cache": statement_cache_metrics.stats()
+    }
@@ -0,0 +1,128 @@
+"""API keys for machine-to-machine clients (generation and cached verification)."""
+import hashlib
+import hmac
+import secrets
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import ApiKey, User, UserRole
+from app.auth.schemas import Principal
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+# Keys look like "nmk_<prefix>_<secret>"; the prefix is stored in clear for lookup
+KEY_SCHEME = "nmk"
+
+
+def generate_api_key() -> tuple[str, str, str]:
+    """
+    Generate a new API key.
+
+    Returns:
+        tuple[str, str, str]: Full key (shown once), lookup prefix and SHA-256 digest
+    """
+    prefix = secrets.token_hex(6)
+    key = f"{KEY_SCHEME}_{prefix}_{secrets.token_urlsafe(32)}"
+    return key, prefix, hash_api_key(key)
+
+
+def hash_api_key(key: str) -> str:
+    """SHA-256 hex digest of an API key (keys are random, so no salt/KDF is needed)."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def key_prefix(key: str) -> Optional[str]:
+    """Lookup prefix of a well-formed key, or None."""
+    parts = key.split("_", 2)
+    if len(parts) != 3 or parts[0] != KEY_SCHEME or not parts[1] or not parts[2]:
+        return None
+    return parts[1]
+
+
+class _CachedKey(NamedTuple):
+    key_hash: str
+    expires_at: Optional[datetime]
+    principal: Principal
+
+
+class ApiKeyCache(LRUCache):
+    """
+    Size-bounded LRU of active API keys by prefix, with a short TTL.
+
+    Revocations and user changes drop entries on this worker; other
+    workers see them within the TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        super().__init__(max_entries=max_entries, ttl=ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every key of a user."""
+        self.discard_where(lambda _, entry: entry.principal.id == user_id)
+
+
+api_key_cache = ApiKeyCache(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl=settings.API_KEY_CACHE_TTL_SECONDS
+)
+
+# Prefixes with no active key; kept apart so a flood of made-up keys
+# can't evict the cached active ones
+unknown_api_key_cache = LRUCache(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl=settings.API_KEY_MISS_CACHE_TTL_SECONDS
+)
+
+
+async def resolve_api_key(db: AsyncSession, key: str) -> Optional[Principal]:
+    """
+    Resolve an API key to the principal of its user.
+
+    The key is hashed once and compared in constant time with the digest
+    cached for its prefix; the database is only read on a cache miss, and
+    prefixes without an active key are remembered for a few seconds.
+
+    Args:
+        db: Database session
+        key: Full API key from the X-API-Key header
+
+    Returns:
+        Optional[Principal]: Principal of the key's user, or None if the key
+        is unknown, revoked, expired or doesn't match
+    """
+    prefix = key_prefix(key)
+    if prefix is None:
+        return None
+    digest = hash_api_key(key)
+
+    entry = api_key_cache.get(prefix)
+    if entry is None:
+        if unknown_api_key_cache.get(prefix) is not None:
+            return None
+        result = await db.execute(
+            select(ApiKey.key_hash, ApiKey.expires_at, User.id, User.email, User.role, User.is_active)
+            .join(User, User.id == ApiKey.user_id)
+            .where(ApiKey.prefix == prefix, ApiKey.revoked_at.is_(None))
+        )
+        row = result.one_or_none()
+        if row is None:
+            unknown_api_key_cache.set(prefix, True)
+            return None
+        principal = Principal(
+            id=row.id,
+            email=row.email,
+            role=UserRole(row.role).value,
+            is_active=row.is_active,
+            api_key_prefix=prefix
+        )
+        entry = _CachedKey(row.key_hash, row.expires_at, principal)
+        api_key_cache.set(prefix, entry)
+
+    if not hmac.compare_digest(entry.key_hash, digest):
+        return None
+    if entry.expires_at is not None and entry.expires_at <= datetime.utcnow():
+        return None
+    return entry.principal
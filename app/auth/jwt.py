@@ -1,22 +1,24 @@
 """JWT token creation and verification."""
 from datetime import timedelta
+from typing import Optional
 from app.core.security import create_access_token, decode_access_token
 from app.core.config import settings
 
 
-def create_user_token(email: str) -> str:
+def create_user_token(email: str, claims: Optional[dict] = None) -> str:
     """
     Create a JWT token for a user.
     
     Args:
         email: User email to encode in token
+        claims: Optional extra claims (uid, role, active)
         
     Returns:
         str: Encoded JWT token
     """
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": email},
+        data={"sub": email, **(claims or {})},
         expires_delta=access_token_expires
     )
     return access_token
@@ -1,6 +1,6 @@
 """User database model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
 import enum
 from app.db.base import Base
 
@@ -26,3 +26,21 @@ class User(Base):
     
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, role={self.role})>"
+
+
+class ApiKey(Base):
+    """API key acting on behalf of a user, for machine-to-machine clients."""
+    
+    __tablename__ = "api_keys"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    prefix = Column(String(16), unique=True, index=True, nullable=False)  # Public lookup part of the key
+    key_hash = Column(String(64), nullable=False)  # SHA-256 hex digest of the full key
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<ApiKey(id={self.id}, name={self.name}, prefix={self.prefix})>"
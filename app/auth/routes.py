@@ -1,14 +1,28 @@
 """Authentication routes."""
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.auth.schemas import LoginRequest, Token, UserOut, UserCreate
-from app.auth.models import User
+from app.auth.schemas import (
+    LoginRequest,
+    Token,
+    UserOut,
+    UserCreate,
+    UserUpdate,
+    Principal,
+    ApiKeyCreate,
+    ApiKeyOut,
+    ApiKeyCreated
+)
+from app.auth.models import User, UserRole, ApiKey
+from app.auth.api_keys import generate_api_key, api_key_cache, unknown_api_key_cache
 from app.auth.jwt import create_user_token
-from app.core.security import verify_password, get_password_hash, get_current_user, get_current_admin
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.core.security import verify_password_async, get_password_hash_async, get_current_user, get_current_admin
+from app.db.session import get_db, get_read_db
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -43,7 +57,7 @@ async def login(
         )
     
     # Verify password
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -58,32 +72,49 @@ async def login(
         )
     
     # Create access token
-    access_token = create_user_token(user.email)
+    claims = None
+    if settings.TOKEN_EMBED_CLAIMS:
+        claims = {"uid": user.id, "role": UserRole(user.role).value, "active": user.is_active}
+    access_token = create_user_token(user.email, claims)
     
     return Token(access_token=access_token)
 
 
 @router.get("/me", response_model=UserOut)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get current authenticated user information.
     
     Args:
-        current_user: Current authenticated user
+        current_user: Current authenticated principal
+        db: Database session
         
     Returns:
         UserOut: User information
+        
+    Raises:
+        HTTPException: If the user no longer exists
     """
-    return current_user
+    result = await db.execute(select(User).where(User.id == current_user.id))
+    user = result.scalar_one_or_none()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    return user
 
 
 @router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_admin)  # Only admin can create users
+    _: Principal = Depends(get_current_admin)  # Only admin can create users
 ):
     """
     Create a new user (Admin only).
@@ -110,7 +141,7 @@ async def create_user(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -122,3 +153,176 @@ async def create_user(
     await db.refresh(new_user)
     
     return new_user
+
+
+@router.patch("/users/{user_id}", response_model=UserOut)
+async def update_user(
+    user_id: int,
+    user_data: UserUpdate,
+    db: AsyncSession = Depends(get_db),
+    _: Principal = Depends(get_current_admin)  # Only admin can update users
+):
+    """
+    Update a user's email, password, role or active status (Admin only).
+    
+    Cached principals of the user are dropped on this worker, so the
+    change applies immediately here and within the principal cache TTL on
+    other workers. Tokens with embedded claims keep their role until they
+    expire.
+    
+    Args:
+        user_id: User ID
+        user_data: Fields to update
+        db: Database session
+        _: Current admin user (for authorization)
+        
+    Returns:
+        UserOut: Updated user information
+        
+    Raises:
+        HTTPException: If the user doesn't exist, the role is unknown or the
+        email is already registered
+    """
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    update_data = user_data.model_dump(exclude_unset=True)
+    
+    if "role" in update_data and update_data["role"] not in {role.value for role in UserRole}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown role. Available: {', '.join(role.value for role in UserRole)}"
+        )
+    
+    if update_data.get("email") and update_data["email"] != user.email:
+        result = await db.execute(select(User.id).where(User.email == update_data["email"]))
+        if result.scalar_one_or_none() is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+    
+    previous_email = user.email
+    password = update_data.pop("password", None)
+    if password:
+        user.hashed_password = await get_password_hash_async(password)
+    for field, value in update_data.items():
+        if value is not None:
+            setattr(user, field, value)
+    
+    await db.commit()
+    await db.refresh(user)
+    
+    principal_cache.invalidate(previous_email)
+    principal_cache.invalidate(user.email)
+    api_key_cache.invalidate_user(user.id)
+    
+    return user
+
+
+@router.post("/api-keys", response_model=ApiKeyCreated, status_code=status.HTTP_201_CREATED)
+async def create_api_key(
+    key_data: ApiKeyCreate,
+    db: AsyncSession = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)  # Only admin can issue keys
+):
+    """
+    Issue an API key acting as a user (Admin only).
+    
+    The key is returned once in this response; only its SHA-256 digest is
+    stored. Clients send it in the `X-API-Key` header.
+    
+    Args:
+        key_data: Key name, owner (defaults to the admin) and optional expiry
+        db: Database session
+        current_admin: Current admin principal
+        
+    Returns:
+        ApiKeyCreated: Key information including the secret key
+        
+    Raises:
+        HTTPException: If the owner doesn't exist
+    """
+    user_id = key_data.user_id or current_admin.id
+    result = await db.execute(select(User.id).where(User.id == user_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    key, prefix, key_hash = generate_api_key()
+    api_key = ApiKey(
+        name=key_data.name,
+        prefix=prefix,
+        key_hash=key_hash,
+        user_id=user_id,
+        expires_at=key_data.expires_at
+    )
+    
+    db.add(api_key)
+    await db.commit()
+    await db.refresh(api_key)
+    unknown_api_key_cache.discard(prefix)
+    
+    return ApiKeyCreated(**ApiKeyOut.model_validate(api_key).model_dump(), key=key)
+
+
+@router.get("/api-keys", response_model=list[ApiKeyOut])
+async def list_api_keys(
+    db: AsyncSession = Depends(get_read_db),
+    _: Principal = Depends(get_current_admin)  # Only admin can list keys
+):
+    """
+    List issued API keys, revoked ones included (Admin only).
+    
+    Args:
+        db: Database session
+        _: Current admin user (for authorization)
+        
+    Returns:
+        list[ApiKeyOut]: API keys without their secrets
+    """
+    result = await db.execute(select(ApiKey).order_by(ApiKey.id))
+    return result.scalars().all()
+
+
+@router.delete("/api-keys/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_key(
+    key_id: int,
+    db: AsyncSession = Depends(get_db),
+    _: Principal = Depends(get_current_admin)  # Only admin can revoke keys
+):
+    """
+    Revoke an API key (Admin only).
+    
+    The key stops working immediately on this worker and within the API
+    key cache TTL on other workers.
+    
+    Args:
+        key_id: API key ID
+        db: Database session
+        _: Current admin user (for authorization)
+        
+    Raises:
+        HTTPException: If the key doesn't exist or is already revoked
+    """
+    result = await db.execute(select(ApiKey).where(ApiKey.id == key_id, ApiKey.revoked_at.is_(None)))
+    api_key = result.scalar_one_or_none()
+    
+    if not api_key:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="API key not found"
+        )
+    
+    api_key.revoked_at = datetime.utcnow()
+    await db.commit()
+    api_key_cache.discard(api_key.prefix)
+    return None
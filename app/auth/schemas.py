@@ -1,6 +1,6 @@
 """Pydantic schemas for User model."""
-from pydantic import BaseModel, EmailStr, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, ConfigDict, field_validator
+from datetime import datetime, timezone
 from typing import Optional
 
 
@@ -34,6 +34,17 @@ class UserOut(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class Principal(BaseModel):
+    """Authenticated identity attached to a request (role and status only)."""
+    id: int
+    email: str
+    role: str
+    is_active: bool
+    api_key_prefix: Optional[str] = None  # Set when authenticated with an API key
+    
+    model_config = ConfigDict(frozen=True)
+
+
 class LoginRequest(BaseModel):
     """Schema for login request."""
     email: EmailStr
@@ -44,3 +55,36 @@ class Token(BaseModel):
     """Schema for JWT token response."""
     access_token: str
     token_type: str = "bearer"
+
+
+class ApiKeyCreate(BaseModel):
+    """Schema for issuing an API key."""
+    name: str
+    user_id: Optional[int] = None  # Defaults to the issuing admin
+    expires_at: Optional[datetime] = None
+    
+    @field_validator("expires_at")
+    @classmethod
+    def naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Store expiries as naive UTC, like every other timestamp column."""
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class ApiKeyOut(BaseModel):
+    """Schema for API key output (the secret is never returned again)."""
+    id: int
+    name: str
+    prefix: str
+    user_id: int
+    expires_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ApiKeyCreated(ApiKeyOut):
+    """Schema for a newly issued API key, including its secret."""
+    key: str
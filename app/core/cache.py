@@ -0,0 +1,212 @@
+"""In-process LRU/TTL caches (generic base and the read query cache)."""
+import functools
+import inspect
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import settings
+from app.core.data_version import data_version
+
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Make an argument hashable for use in a cache key."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate the memory held by a cached value.
+
+    Args:
+        value: Query result (rows, mappings, lists, scalars)
+
+    Returns:
+        int: Size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+    if hasattr(value, "items"):
+        return size + sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item) for item in value)
+    return size
+
+
+class LRUCache:
+    """
+    In-process LRU cache with per-entry expiry and hit/miss counters.
+
+    Bounded by number of entries (`max_entries`) or by estimated size in
+    bytes (`max_bytes`). Entries expire `ttl` seconds after being stored,
+    or at an explicit deadline given to `set` on the cache's clock; with
+    neither, they only leave through eviction. A bound or TTL of 0
+    disables the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        bound = self.max_bytes if self.max_bytes is not None else self.max_entries
+        return bool(bound and bound > 0) and (self.ttl is None or self.ttl > 0)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default`."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, _, expires_at = entry
+        if expires_at is not None and self.clock() >= expires_at:
+            self._remove(key)
+            self.expired += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries over the bound.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expires_at: Deadline on the cache's clock (defaults to now + ttl)
+        """
+        if not self.enabled:
+            return
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        if expires_at is None and self.ttl is not None:
+            expires_at = self.clock() + self.ttl
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        while (
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Drop an entry if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Drop every entry for which `predicate(key, value)` is true."""
+        for key in [key for key, (value, _, _) in self._entries.items() if predicate(key, value)]:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and size."""
+        lookups = self.hits + self.misses
+        stats = {"entries": len(self._entries)}
+        if self.max_bytes is not None:
+            stats.update(bytes=self._bytes, max_bytes=self.max_bytes)
+        if self.max_entries is not None:
+            stats["max_entries"] = self.max_entries
+        stats.update(
+            hits=self.hits,
+            misses=self.misses,
+            expired=self.expired,
+            evictions=self.evictions,
+            hit_ratio=round(self.hits / lookups, 4) if lookups else None,
+        )
+        return stats
+
+
+class ResponseCache(LRUCache):
+    """
+    Size-bounded LRU cache with per-entry TTL for read-only query functions.
+
+    Keys include the data version, so entries computed before a write are
+    never served again; local writes also clear the cache to free memory.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        super().__init__(max_bytes=max_bytes, ttl=ttl)
+
+    def cached(self, name: str) -> Callable:
+        """
+        Decorate an async query function taking the session as first argument.
+
+        The key is the function name, the current data version and the
+        call's arguments bound to the signature (defaults applied), so
+        positional and keyword calls share entries.
+
+        Args:
+            name: Namespace of the function in the cache
+        """
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            async def wrapper(db, *args, **kwargs):
+                if not self.enabled:
+                    return await func(db, *args, **kwargs)
+
+                bound = signature.bind(db, *args, **kwargs)
+                bound.apply_defaults()
+                arguments = tuple(
+                    (key, _freeze(value))
+                    for key, value in list(bound.arguments.items())[1:]
+                )
+                key = (name, await data_version.current(db), arguments)
+
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                value = await func(db, *args, **kwargs)
+                self.set(key, value)
+                return value
+
+            return wrapper
+        return decorator
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+data_version.subscribe(response_cache.clear)
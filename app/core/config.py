@@ -13,16 +13,82 @@ class Settings(BaseSettings):
         "sqlite+aiosqlite:///./nomenclature.db"
     )
     
+    # Optional read replica for catalogue reads (defaults to DATABASE_URL,
+    # with a separate pool)
+    DATABASE_READ_URL: Optional[str] = None
+    
+    # Connection pool (per worker and per engine); ignored for in-memory SQLite
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    # Ping on every checkout (one extra round trip); off by default since
+    # DB_POOL_RECYCLE already retires connections before idle timeouts
+    DB_POOL_PRE_PING: bool = False
+    
+    # SQLite profile applied on connect (ignored for other databases);
+    # negative cache_size is in KiB
+    SQLITE_PRAGMAS_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: Optional[str] = "WAL"
+    SQLITE_SYNCHRONOUS: Optional[str] = "NORMAL"
+    SQLITE_MMAP_SIZE: Optional[int] = 268435456
+    SQLITE_CACHE_SIZE: Optional[int] = -65536
+    SQLITE_TEMP_STORE: Optional[str] = "MEMORY"
+    
     # JWT
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Verified tokens kept per worker to skip signature checks (0 disables it)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Cache of resolved users per token (0 disables it); role/active changes
+    # made on another worker are seen after at most the TTL
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    
+    # Cache of active API keys per worker; revocations made on another
+    # worker are seen after at most the TTL
+    API_KEY_CACHE_MAX_ENTRIES: int = 1000
+    API_KEY_CACHE_TTL_SECONDS: float = 60.0
+    # Unknown or revoked prefixes are remembered briefly, so made-up keys
+    # don't each cost a database query
+    API_KEY_MISS_CACHE_TTL_SECONDS: float = 5.0
+    
+    # Per-client request budgets, per worker (token buckets: sustained rate
+    # and burst) and in-flight requests allowed per client
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_READ_PER_MINUTE: float = 600
+    RATE_LIMIT_READ_BURST: float = 60
+    RATE_LIMIT_EXPORT_PER_MINUTE: float = 6
+    RATE_LIMIT_EXPORT_BURST: float = 3
+    RATE_LIMIT_IMPORT_PER_MINUTE: float = 2
+    RATE_LIMIT_IMPORT_BURST: float = 2
+    RATE_LIMIT_MAX_CONCURRENT: int = 4
+    
+    # Threads hashing/verifying passwords per worker (bcrypt is CPU-bound)
+    PASSWORD_HASH_WORKERS: int = 2
+    
+    # Embed role and active flag in tokens so requests skip the users table;
+    # changes then only apply to tokens issued afterwards
+    TOKEN_EMBED_CLAIMS: bool = False
+    
     # App
     APP_NAME: str = "Nomenclature API"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
     
+    # How long a worker trusts its cached data version before re-reading it
+    DATA_VERSION_TTL_SECONDS: float = 1.0
+    
+    # In-process cache of read queries (0 disables it)
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    
+    # Directory where Parquet exports are cached
+    EXPORT_CACHE_DIR: str = "./export_cache"
+    
     # Admin (initial user)
     ADMIN_EMAIL: str = "admin@nomenclature.dz"
     ADMIN_PASSWORD: str = "Admin2025!"
@@ -0,0 +1,83 @@
+"""Monotonic version of the nomenclature data, used for cache validation."""
+import time
+from typing import Callable, List
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.data_version import DataVersion
+
+# Primary key of the single counter row
+_ROW_ID = 1
+
+
+class DataVersionTracker:
+    """
+    Reads and bumps the data-version counter.
+
+    The counter lives in the database so every worker sees writes made by
+    the others; each worker keeps the last value for DATA_VERSION_TTL_SECONDS
+    so read requests normally don't query it, and drops it as soon as one of
+    its own writes commits.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+        self._subscribers: List[Callable[[], None]] = []
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback run after each write committed by this worker.
+
+        Args:
+            callback: Function without arguments (e.g. a cache clear)
+        """
+        self._subscribers.append(callback)
+
+    def expire(self, *args) -> None:
+        """Forget the locally cached value and notify subscribers."""
+        self._expires_at = 0.0
+        for callback in self._subscribers:
+            callback()
+
+    async def current(self, db: AsyncSession) -> int:
+        """
+        Get the current data version.
+
+        Args:
+            db: Database session (queried only when the cached value expired)
+
+        Returns:
+            int: Current data version
+        """
+        now = time.monotonic()
+        if self._value is None or now >= self._expires_at:
+            result = await db.execute(select(DataVersion.version).where(DataVersion.id == _ROW_ID))
+            self._value = result.scalar_one_or_none() or 0
+            self._expires_at = now + self.ttl
+        return self._value
+
+    async def bump(self, db: AsyncSession) -> None:
+        """
+        Increment the data version inside the caller's transaction.
+
+        Must be called before the caller commits its write; the local
+        cached value is dropped once that commit succeeds.
+
+        Args:
+            db: Database session carrying the write
+        """
+        result = await db.execute(
+            update(DataVersion)
+            .where(DataVersion.id == _ROW_ID)
+            .values(version=DataVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            await db.execute(insert(DataVersion).values(id=_ROW_ID, version=1))
+        event.listen(db.sync_session, "after_commit", self.expire, once=True)
+
+
+data_version = DataVersionTracker(ttl=settings.DATA_VERSION_TTL_SECONDS)
@@ -0,0 +1,50 @@
+"""Conditional GET support (weak ETags derived from the data version)."""
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.data_version import data_version
+from app.db.session import get_read_db
+
+
+async def etag_guard(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+) -> str:
+    """
+    Compute the ETag of a read request and short-circuit with 304 if it matches.
+    
+    The ETag combines the data version with the path and query parameters,
+    so it changes whenever the nomenclature is written. Declare this
+    dependency after authentication so unauthenticated clients get 401.
+    
+    Args:
+        request: Incoming request
+        response: Response whose headers receive the ETag
+        db: Database session (only used when the cached data version expired)
+        
+    Returns:
+        str: ETag value, for routes that build their own Response
+        
+    Raises:
+        HTTPException: 304 Not Modified if If-None-Match matches
+    """
+    version = await data_version.current(db)
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{params}".encode()).hexdigest()[:16]
+    etag = f'W/"{version}-{digest}"'
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison: W/"x" and "x" designate the same representation
+        if "*" in candidates or etag in candidates or etag[2:] in candidates:
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag}
+            )
+    
+    response.headers["ETag"] = etag
+    return etag
@@ -0,0 +1,26 @@
+"""In-process cache of authenticated principals (role and active flag per token)."""
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+
+class PrincipalCache(LRUCache):
+    """
+    Size-bounded LRU of resolved principals with a short TTL.
+
+    Keys are (subject, token issued-at), so a new login always resolves
+    the user again. Entries of a user are dropped locally when an admin
+    changes them; other workers pick the change up within the TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        super().__init__(max_entries=max_entries, ttl=ttl)
+
+    def invalidate(self, subject: str) -> None:
+        """Drop every cached principal of a user."""
+        self.discard_where(lambda key, _: key[0] == subject)
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,178 @@
+"""Per-client token-bucket rate limiting and concurrency quotas (per worker)."""
+import math
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.security import get_current_user
+
+# Clean up idle buckets at most this often
+SWEEP_INTERVAL_SECONDS = 60.0
+
+
+class RateLimiter:
+    """
+    Token buckets per (client, budget) plus a cap on in-flight requests per client.
+
+    A bucket that has been idle long enough to refill completely is
+    indistinguishable from a new one, so such buckets are dropped by a
+    periodic sweep: memory stays proportional to recently active clients.
+    """
+
+    def __init__(self, budgets: Dict[str, Tuple[float, float]], max_concurrent: int):
+        """
+        Args:
+            budgets: Budget name -> (tokens per second, burst size)
+            max_concurrent: In-flight requests allowed per client (0 = unlimited)
+        """
+        self.budgets = budgets
+        self.max_concurrent = max_concurrent
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._last_sweep = time.monotonic()
+        self.allowed = {budget: 0 for budget in budgets}
+        self.limited = {budget: 0 for budget in budgets}
+        self.concurrency_limited = 0
+        self.evictions = 0
+
+    def consume(self, client: str, budget: str) -> Optional[float]:
+        """
+        Take one token from a client's bucket.
+
+        Returns:
+            Optional[float]: None if allowed, else seconds until a token is available
+        """
+        rate, burst = self.budgets[budget]
+        now = time.monotonic()
+        self._maybe_sweep(now)
+
+        bucket = self._buckets.get((client, budget))
+        if bucket is None:
+            bucket = self._buckets[client, budget] = [burst, now]
+        else:
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            self.allowed[budget] += 1
+            return None
+        self.limited[budget] += 1
+        return (1 - bucket[0]) / rate
+
+    def acquire(self, client: str) -> bool:
+        """Take an in-flight slot for a client; False if its quota is used up."""
+        in_flight = self._in_flight.get(client, 0)
+        if self.max_concurrent and in_flight >= self.max_concurrent:
+            self.concurrency_limited += 1
+            return False
+        self._in_flight[client] = in_flight + 1
+        return True
+
+    def release(self, client: str) -> None:
+        """Give back an in-flight slot."""
+        in_flight = self._in_flight.get(client, 0) - 1
+        if in_flight > 0:
+            self._in_flight[client] = in_flight
+        else:
+            self._in_flight.pop(client, None)
+
+    def _maybe_sweep(self, now: float) -> None:
+        """Drop buckets that have refilled completely."""
+        if now - self._last_sweep < SWEEP_INTERVAL_SECONDS:
+            return
+        self._last_sweep = now
+        idle = [
+            key for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * self.budgets[key[1]][0] >= self.budgets[key[1]][1]
+        ]
+        for key in idle:
+            del self._buckets[key]
+        self.evictions += len(idle)
+
+    def stats(self) -> dict:
+        """Counters and tracked state."""
+        return {
+            "buckets": len(self._buckets),
+            "clients_in_flight": len(self._in_flight),
+            "allowed": dict(self.allowed),
+            "limited": dict(self.limited),
+            "concurrency_limited": self.concurrency_limited,
+            "evictions": self.evictions,
+        }
+
+
+rate_limiter = RateLimiter(
+    budgets={
+        "read": (settings.RATE_LIMIT_READ_PER_MINUTE / 60, settings.RATE_LIMIT_READ_BURST),
+        "export": (settings.RATE_LIMIT_EXPORT_PER_MINUTE / 60, settings.RATE_LIMIT_EXPORT_BURST),
+        "import": (settings.RATE_LIMIT_IMPORT_PER_MINUTE / 60, settings.RATE_LIMIT_IMPORT_BURST),
+    },
+    max_concurrent=settings.RATE_LIMIT_MAX_CONCURRENT
+)
+
+
+def client_key(principal) -> str:
+    """Rate limiting identity of a principal: its API key, else its user."""
+    if principal.api_key_prefix:
+        return f"key:{principal.api_key_prefix}"
+    return f"user:{principal.id}"
+
+
+def rate_limit(budget: str) -> Callable:
+    """
+    Build a route dependency charging one request to `budget`.
+
+    The client's in-flight slot is released by RateLimitMiddleware once
+    the response (streamed bodies included) has been sent.
+
+    Args:
+        budget: read, export or import
+    """
+    async def dependency(request: Request, current_user=Depends(get_current_user)):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        client = client_key(current_user)
+
+        if not rate_limiter.acquire(client):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent requests",
+                headers={"Retry-After": "1"}
+            )
+        request.state.rate_limit_client = client
+
+        retry_after = rate_limiter.consume(client, budget)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded for {budget} requests",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    return dependency
+
+
+limit_reads = rate_limit("read")
+limit_exports = rate_limit("export")
+limit_imports = rate_limit("import")
+
+
+class RateLimitMiddleware:
+    """ASGI middleware releasing the client's in-flight slot at the end of the response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            client = scope.get("state", {}).get("rate_limit_client")
+            if client is not None:
+                rate_limiter.release(client)
@@ -1,21 +1,34 @@
 """Security utilities for password hashing and JWT token verification."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.auth.schemas import Principal
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.principal_cache import principal_cache
+from app.core.token_cache import token_cache
+from app.db.session import get_read_db
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# HTTP Bearer token scheme
-security = HTTPBearer()
+# Dedicated threads for bcrypt, so hashing never blocks the event loop and
+# a burst of logins can't take more than this many cores per worker
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+# HTTP Bearer token scheme, or an API key header for machine clients
+security = HTTPBearer(auto_error=False)
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -45,6 +58,35 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the password hashing pool.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+        
+    Returns:
+        bool: True if password matches, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password in the password hashing pool.
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        str: Hashed password
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -62,7 +104,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -71,80 +113,146 @@ def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and verify a JWT access token.
     
+    Tokens already verified by this worker are served from the verified
+    token cache until they expire.
+    
     Args:
         token: JWT token to decode
         
     Returns:
         Optional[dict]: Decoded token payload or None if invalid
     """
+    key = token_cache.digest(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    token_cache.set(key, payload)
+    return payload
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-):
+async def _principal_from_token(db: AsyncSession, token: str):
     """
-    Get the current authenticated user from JWT token.
+    Resolve a bearer JWT to a principal.
+    
+    The principal is read from the token claims when they are embedded
+    (TOKEN_EMBED_CLAIMS), otherwise from a short-lived cache keyed by
+    (subject, iat), and from the users table only on a cache miss.
     
     Args:
-        credentials: HTTP Bearer credentials
         db: Database session
+        token: Encoded JWT
         
     Returns:
-        User: Current authenticated user
-        
-    Raises:
-        HTTPException: If token is invalid or user not found
+        Optional[Principal]: Principal, or None if the token is invalid or
+        its user doesn't exist
     """
-    from app.auth.models import User
+    from app.auth.models import User, UserRole
     
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    token = credentials.credentials
     payload = decode_access_token(token)
-    
     if payload is None:
-        raise credentials_exception
+        return None
     
     email: str = payload.get("sub")
     if email is None:
-        raise credentials_exception
+        return None
+    
+    if settings.TOKEN_EMBED_CLAIMS and "uid" in payload and "role" in payload:
+        return Principal(
+            id=payload["uid"],
+            email=email,
+            role=payload["role"],
+            is_active=payload.get("active", True)
+        )
+    
+    issued_at = payload.get("iat")
+    principal = principal_cache.get((email, issued_at))
+    if principal is None:
+        result = await db.execute(
+            select(User.id, User.email, User.role, User.is_active).where(User.email == email)
+        )
+        user = result.one_or_none()
+        
+        if user is None:
+            return None
+        
+        principal = Principal(
+            id=user.id,
+            email=user.email,
+            role=UserRole(user.role).value,
+            is_active=user.is_active
+        )
+        principal_cache.set((email, issued_at), principal)
+    return principal
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    api_key: Optional[str] = Depends(api_key_header),
+    db: AsyncSession = Depends(get_read_db)
+) -> Principal:
+    """
+    Get the current authenticated principal from a JWT token or an API key.
     
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    A bearer token takes precedence; otherwise an `X-API-Key` header
+    resolves to the principal of the key's user.
     
-    if user is None:
-        raise credentials_exception
+    Args:
+        credentials: HTTP Bearer credentials
+        api_key: API key from the X-API-Key header
+        db: Database session
+        
+    Returns:
+        Principal: Current authenticated principal (id, email, role, active flag)
+        
+    Raises:
+        HTTPException: If no credentials are given, they are invalid or the
+        user is not found or inactive
+    """
+    from app.auth.api_keys import resolve_api_key
+    
+    if credentials is not None:
+        principal = await _principal_from_token(db, credentials.credentials)
+    elif api_key:
+        principal = await resolve_api_key(db, api_key)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
     
-    return user
+    return principal
 
 
 async def get_current_admin(
-    current_user = Depends(get_current_user)
-):
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Verify that the current user has admin role.
     
     Args:
-        current_user: Current authenticated user
+        current_user: Current authenticated principal
         
     Returns:
-        User: Current admin user
+        Principal: Current admin principal
         
     Raises:
         HTTPException: If user is not an admin
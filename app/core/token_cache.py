@@ -0,0 +1,37 @@
+"""In-process cache of verified JWTs, to skip repeated signature checks."""
+import hashlib
+import time
+from typing import Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+
+class VerifiedTokenCache(LRUCache):
+    """
+    Size-bounded LRU of tokens whose signature has been verified.
+
+    Entries are keyed by the SHA-256 digest of the token (the token itself
+    is never stored) and map to the decoded payload until the token's
+    `exp`, after which they are dropped and the token is rejected by a
+    fresh verification.
+    """
+
+    def __init__(self, max_entries: int):
+        super().__init__(max_entries=max_entries, clock=time.time)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Cache key of a token."""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def set(self, key: bytes, payload: dict, expires_at: Optional[float] = None) -> None:
+        """Remember a verified payload until its expiry (`exp` claim by default)."""
+        if expires_at is None:
+            expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        super().set(key, payload, expires_at=float(expires_at))
+
+
+token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
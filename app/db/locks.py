@@ -0,0 +1,24 @@
+"""Transaction-scoped locks serializing one-time seeding across workers."""
+from sqlalchemy import delete, false, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def lock_for_seeding(db: AsyncSession, lock_id: int, model) -> None:
+    """
+    Serialize a seeding step across workers until the transaction ends.
+
+    PostgreSQL takes a transaction-level advisory lock; on SQLite a no-op
+    DELETE takes the database write lock, so a check that follows sees
+    any seed another worker committed meanwhile. On SQLite a busy timeout
+    raises OperationalError, which callers treat as "another worker is
+    seeding".
+
+    Args:
+        db: Database session (without an open transaction)
+        lock_id: Advisory lock key, unique per seeding step
+        model: Table written by the step (target of the SQLite no-op DELETE)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(select(func.pg_advisory_xact_lock(lock_id)))
+    else:
+        await db.execute(delete(model).where(false()))
@@ -0,0 +1,120 @@
+"""Instrumented connection pool (checkouts, wait times, overflow and timeouts)."""
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """Counters of a connection pool, shared across its recreations."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.overflows = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+    def stats(self) -> dict:
+        """Counters with average wait per checkout."""
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "max_checked_out": self.max_checked_out,
+            "overflows": self.overflows,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else None,
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+        }
+
+
+def _listen(pool: "InstrumentedQueuePool", metrics: PoolMetrics) -> None:
+    """Count connections and checkouts through pool events."""
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        metrics.checked_out += 1
+        if metrics.checked_out > metrics.max_checked_out:
+            metrics.max_checked_out = metrics.checked_out
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checked_out -= 1
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool recording how long callers wait for a connection,
+    how often overflow connections are opened and how often the pool
+    times out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Recreated pools (engine.dispose) inherit the listeners and counters
+        if "_dispatch" not in kwargs:
+            self.metrics = PoolMetrics()
+            _listen(self, self.metrics)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+    def _inc_overflow(self) -> bool:
+        # A new connection beyond pool_size is an overflow connection
+        opened = super()._inc_overflow()
+        if opened and self._overflow > 0:
+            self.metrics.overflows += 1
+        return opened
+
+    def stats(self) -> dict:
+        """Current pool status and cumulative counters."""
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "timeout": self._timeout,
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            **self.metrics.stats(),
+        }
+
+
+def pool_stats(engine) -> dict:
+    """
+    Statistics of an engine's pool.
+
+    Args:
+        engine: Async or sync engine
+
+    Returns:
+        dict: Pool metrics, or its status line when it isn't instrumented
+    """
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"instrumented": False, "status": pool.status()}
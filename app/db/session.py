@@ -1,15 +1,78 @@
 """Database session management."""
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from typing import AsyncGenerator
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.sqlite import configure_sqlite
+from app.db.statement_cache import statement_cache_metrics
 
-# Create async engine
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    """Whether a URL points at an in-memory SQLite database."""
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def pool_options(database_url: str) -> dict:
+    """
+    Connection pool options for a database URL.
+    
+    In-memory SQLite databases keep SQLAlchemy's default single-connection
+    pool; every other database gets the configured, instrumented queue pool.
+    
+    Args:
+        database_url: Database URL
+        
+    Returns:
+        dict: Keyword arguments for create_async_engine
+    """
+    if _is_memory_sqlite(database_url):
+        return {}
+    return dict(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+
+
+# Create async engine (writes: admin CRUD, importer, bootstrap)
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    **pool_options(settings.DATABASE_URL)
 )
 
+# Read engine with its own pool, optionally on a replica, so long write
+# transactions don't hold the connections catalogue reads need. An
+# in-memory database only exists on its own connection, so it is shared.
+READ_DATABASE_URL = settings.DATABASE_READ_URL or settings.DATABASE_URL
+if _is_memory_sqlite(READ_DATABASE_URL) and READ_DATABASE_URL == settings.DATABASE_URL:
+    read_engine = engine
+else:
+    read_engine = create_async_engine(
+        READ_DATABASE_URL,
+        echo=settings.DEBUG,
+        future=True,
+        **pool_options(READ_DATABASE_URL)
+    )
+
+# SQLite profile (WAL, page cache, mmap) on both engines
+configure_sqlite(engine)
+if read_engine is not engine:
+    configure_sqlite(read_engine)
+
+# Compiled statement cache hits/misses, reported in admin metrics
+statement_cache_metrics.instrument(engine, "write")
+if read_engine is not engine:
+    statement_cache_metrics.instrument(read_engine, "read")
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -19,6 +82,15 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+# Session factory for read-only work
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -32,3 +104,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting async read-only database sessions.
+    
+    Sessions come from the read engine (replica when DATABASE_READ_URL is
+    set); they must not be used to write.
+    
+    Yields:
+        AsyncSession: Read-only database session
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,55 @@
+"""SQLite connection profile (journal mode, durability and cache pragmas)."""
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+
+def sqlite_pragmas() -> list:
+    """
+    PRAGMA statements run on every new SQLite connection.
+    
+    WAL lets catalogue reads proceed while an import holds the write lock,
+    and synchronous=NORMAL is durable enough in WAL mode (only the last
+    transactions can be lost on power failure, never corrupted).
+    
+    Returns:
+        list: PRAGMA statements, in execution order
+    """
+    pragmas = []
+    if settings.SQLITE_JOURNAL_MODE:
+        pragmas.append(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    if settings.SQLITE_SYNCHRONOUS:
+        pragmas.append(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    if settings.SQLITE_MMAP_SIZE is not None:
+        pragmas.append(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    if settings.SQLITE_CACHE_SIZE is not None:
+        pragmas.append(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    if settings.SQLITE_TEMP_STORE:
+        pragmas.append(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+    return pragmas
+
+
+def configure_sqlite(engine: AsyncEngine) -> None:
+    """
+    Apply the SQLite profile to an engine through its connect event.
+    
+    Does nothing for other databases or when SQLITE_PRAGMAS_ENABLED is off.
+    
+    Args:
+        engine: Async engine
+    """
+    if not settings.SQLITE_PRAGMAS_ENABLED or engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas()
+    if not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
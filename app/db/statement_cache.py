@@ -0,0 +1,45 @@
+"""Compiled statement cache metrics (hits and misses of SQLAlchemy's cache)."""
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class StatementCacheMetrics:
+    """Counts of executions by compiled cache outcome, across engines."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.engines: dict = {}
+
+    def instrument(self, engine: AsyncEngine, name: str) -> None:
+        """Count the cache outcome of every statement run on an engine."""
+        self.engines[name] = engine
+
+        @event.listens_for(engine.sync_engine, "after_cursor_execute")
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            if context.cache_hit == CACHE_HIT:
+                self.hits += 1
+            elif context.cache_hit == CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def stats(self) -> dict:
+        """Counters, hit ratio and current size of each compiled cache."""
+        cached = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_ratio": round(self.hits / cached, 4) if cached else None,
+            "entries": {
+                name: len(engine.sync_engine._compiled_cache)
+                for name, engine in self.engines.items()
+                if engine.sync_engine._compiled_cache is not None
+            },
+        }
+
+
+statement_cache_metrics = StatementCacheMetrics()
@@ -1,10 +1,15 @@
-"""Excel file parser for nomenclature import."""
+"""Excel file parser for nomenclature import.
+
+pandas (and openpyxl, its Excel engine) are imported on first use, so
+workers that never import files don't load them.
+"""
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
-import openpyxl
-import pandas as pd
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from io import BytesIO
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def get_available_sheets(file_content: bytes) -> List[Dict[str, Any]]:
     """
@@ -16,6 +21,8 @@ def get_available_sheets(file_content: bytes) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of sheet information
     """
+    import pandas as pd
+    
     try:
         excel_file = pd.ExcelFile(BytesIO(file_content))
         sheets = []
@@ -66,6 +73,8 @@ def detect_header_row(file_content: bytes, sheet_name: str) -> Optional[int]:
     Returns:
         Optional[int]: Row index of header, or None if not found
     """
+    import pandas as pd
+    
     try:
         # Read first 20 rows without header
         df = pd.read_excel(BytesIO(file_content), sheet_name=sheet_name, header=None, nrows=20)
@@ -89,7 +98,7 @@ def detect_header_row(file_content: bytes, sheet_name: str) -> Optional[int]:
         return 0
 
 
-def detect_sheet_type(df: pd.DataFrame) -> str:
+def detect_sheet_type(df: "pd.DataFrame") -> str:
     """
     Detect the type of data in a sheet based on column names.
     
@@ -126,6 +135,8 @@ def parse_excel_file(file_content: bytes, sheet_name: str = None) -> List[Dict[s
     Raises:
         ValueError: If file format is invalid
     """
+    import pandas as pd
+    
     try:
         # Detect header row
         if sheet_name is None:
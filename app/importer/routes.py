@@ -8,10 +8,15 @@ import json
 
 from app.importer.excel_parser import parse_excel_file, validate_medicament_record, get_available_sheets
 from app.medicaments.models import Medicament
+from app.medicaments.crud import refresh_statistics
+from app.medicaments.history import HistoryRecorder
+from app.medicaments.suggest import suggest_index
+from app.core.data_version import data_version
 from app.models.import_log import ImportLog
-from app.auth.models import User
+from app.auth.schemas import Principal
 from app.core.security import get_current_admin
-from app.db.session import get_db
+from app.core.rate_limit import limit_imports
+from app.db.session import get_db, get_read_db
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/import", tags=["Import"])
@@ -87,10 +92,10 @@ class ImportResult:
         }
 
 
-@router.post("/sheets/preview", response_model=SheetsPreviewResponse)
+@router.post("/sheets/preview", response_model=SheetsPreviewResponse, dependencies=[Depends(limit_imports)])
 async def preview_excel_sheets(
     file: UploadFile = File(..., description="Excel file to preview"),
-    current_user: User = Depends(get_current_admin)  # Admin only
+    current_user: Principal = Depends(get_current_admin)  # Admin only
 ):
     """
     Preview available sheets in an Excel file without importing.
@@ -135,14 +140,14 @@ async def preview_excel_sheets(
         )
 
 
-@router.post("/nomenclature")
+@router.post("/nomenclature", dependencies=[Depends(limit_imports)])
 async def import_nomenclature(
     file: UploadFile = File(..., description="Excel file containing nomenclature"),
     version: str = Form(..., description="Version of nomenclature (e.g., 2025-07-31)"),
     sheet_names: Optional[str] = Form(None, description="Comma-separated list of sheet names to import (empty = all sheets)"),
     remplacer_version: bool = Form(False, description="Replace existing version"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin)  # Admin only
+    current_user: Principal = Depends(get_current_admin)  # Admin only
 ):
     """
     Import nomenclature from Excel file (supports multi-sheet import).
@@ -182,6 +187,7 @@ async def import_nomenclature(
     await db.commit()
     
     result = ImportResult(version=version, filename=file.filename)
+    history = HistoryRecorder()
     
     try:
         # Read file content
@@ -224,6 +230,8 @@ async def import_nomenclature(
             existing_medicaments = update_result.scalars().all()
             for med in existing_medicaments:
                 med.deleted = True
+                history.add(med, "delete")
+            await history.flush(db)
             await db.commit()
         
         # Process each sheet
@@ -278,15 +286,18 @@ async def import_nomenclature(
                             for key, value in record.items():
                                 if key not in ['id', 'created_at']:
                                     setattr(existing_med, key, value)
+                            history.add(existing_med, "update")
                             sheet_updated += 1
                         else:
                             # Create new medicament
                             new_medicament = Medicament(**record)
                             db.add(new_medicament)
+                            history.add(new_medicament, "create")
                             sheet_inserted += 1
                         
                         # Commit every 100 records to avoid memory issues
                         if (sheet_inserted + sheet_updated) % 100 == 0:
+                            await history.flush(db)
                             await db.commit()
                             
                     except Exception as e:
@@ -298,6 +309,7 @@ async def import_nomenclature(
                         continue
                 
                 # Final commit for this sheet
+                await history.flush(db)
                 await db.commit()
                 
                 # Add sheet result
@@ -333,14 +345,22 @@ async def import_nomenclature(
                 all_errors.append({"sheet": sheet_name, **error})
         
         import_log.errors = json.dumps(all_errors) if all_errors else None
+        await refresh_statistics(db)
+        await data_version.bump(db)
         await db.commit()
         
+        # Refresh the autocomplete index with the new catalogue
+        await suggest_index.rebuild(db)
+        
         return result.to_dict()
         
     except Exception as e:
         # Update import log with error
         import_log.end_time = datetime.utcnow()
         import_log.errors = json.dumps([{"message": str(e)}])
+        # Partial imports may have been committed
+        await refresh_statistics(db)
+        await data_version.bump(db)
         await db.commit()
         
         raise HTTPException(
@@ -352,8 +372,8 @@ async def import_nomenclature(
 @router.get("/duplicates")
 async def detect_duplicates(
     version: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     Detect duplicate codes in the database.
@@ -413,7 +433,7 @@ async def clean_duplicates(
     keep_strategy: str = "latest",  # "latest" or "first"
     dry_run: bool = True,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin)
+    current_user: Principal = Depends(get_current_admin)
 ):
     """
     Clean duplicate codes in the database by keeping only one entry.
@@ -462,6 +482,7 @@ async def clean_duplicates(
     
     cleaned = []
     total_deleted = 0
+    history = HistoryRecorder()
     
     # Process each duplicate group
     for dup in duplicates:
@@ -493,6 +514,7 @@ async def clean_duplicates(
                 
                 if not dry_run:
                     entry.deleted = True
+                    history.add(entry, "delete")
                 
                 total_deleted += 1
             
@@ -511,6 +533,9 @@ async def clean_duplicates(
             })
     
     if not dry_run:
+        await history.flush(db)
+        await refresh_statistics(db)
+        await data_version.bump(db)
         await db.commit()
     
     return {
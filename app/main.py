@@ -7,10 +7,14 @@ from app.core.config import settings
 from app.auth.routes import router as auth_router
 from app.medicaments.routes import router as medicaments_router
 from app.importer.routes import router as import_router
-from app.db.session import engine
+from app.admin.routes import router as admin_router
+from app.core.rate_limit import RateLimitMiddleware
+from app.db.session import engine, read_engine
 from app.db.base import Base
 from app.auth.models import User
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
+from app.medicaments.history import ensure_baseline
+from app.medicaments.crud import ensure_statistics
 
 
 @asynccontextmanager
@@ -41,7 +45,7 @@ async def lifespan(app: FastAPI):
         if not admin_user:
             admin_user = User(
                 email=settings.ADMIN_EMAIL,
-                hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
+                hashed_password=await get_password_hash_async(settings.ADMIN_PASSWORD),
                 role="ADMIN",
                 is_active=True
             )
@@ -51,10 +55,23 @@ async def lifespan(app: FastAPI):
         else:
             print(f"ℹ️  Admin user already exists: {settings.ADMIN_EMAIL}")
     
+    # Seed the medicament history with the current catalogue on first start
+    async with AsyncSessionLocal() as session:
+        baseline = await ensure_baseline(session)
+        if baseline:
+            print(f"✅ Medicament history initialized ({baseline} snapshots)")
+    
+    # Build the materialized statistics before any write patches them
+    async with AsyncSessionLocal() as session:
+        if await ensure_statistics(session):
+            print("✅ Medicament statistics built")
+    
     yield
     
     # Cleanup
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 # Create FastAPI app
@@ -74,12 +91,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Release per-client in-flight slots once responses are fully sent
+app.add_middleware(RateLimitMiddleware)
+
 
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Check API health status with last import information."""
-    from app.db.session import AsyncSessionLocal
+    from app.db.session import ReadSessionLocal
     from app.models.import_log import ImportLog
     from sqlalchemy import select
     
@@ -91,7 +111,7 @@ async def health_check():
     
     # Get last successful import
     try:
-        async with AsyncSessionLocal() as session:
+        async with ReadSessionLocal() as session:
             result = await session.execute(
                 select(ImportLog)
                 .where(ImportLog.end_time.is_not(None))
@@ -113,6 +133,7 @@ async def health_check():
 app.include_router(auth_router)
 app.include_router(medicaments_router)
 app.include_router(import_router)
+app.include_router(admin_router)
 
 
 if __name__ == "__main__":
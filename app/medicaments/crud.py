@@ -1,14 +1,33 @@
 """CRUD operations for Medicament model."""
-from typing import Optional, List
+from typing import Optional, List, Sequence, AsyncIterator
+from collections import Counter
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from datetime import date
+from sqlalchemy import select, func, and_, or_, insert, update, delete, bindparam, Integer
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import RowMapping
+from datetime import date, datetime
 
-from app.medicaments.models import Medicament
-from app.medicaments.schemas import MedicamentCreate, MedicamentUpdate
+from app.medicaments.models import Medicament, MedicamentStatistic, MedicamentHistory
+from app.medicaments.schemas import (
+    MedicamentCreate,
+    MedicamentUpdate,
+    BulkCreate,
+    BulkUpdate,
+    BulkOperation,
+    MEDICAMENT_FIELDS
+)
+from app.medicaments.search import search_index
+from app.medicaments.history import record_history, snapshot_row
+from app.core.cache import response_cache
+from app.core.data_version import data_version
+from app.db.locks import lock_for_seeding
+from app.db.session import AsyncSessionLocal
 
 
-async def get_medicament_by_id(db: AsyncSession, medicament_id: int) -> Optional[Medicament]:
+@response_cache.cached("medicament_by_id")
+async def get_medicament_by_id(db: AsyncSession, medicament_id: int) -> Optional[RowMapping]:
     """
     Get a medicament by ID (excluding deleted ones).
     
@@ -17,19 +36,120 @@ async def get_medicament_by_id(db: AsyncSession, medicament_id: int) -> Optional
         medicament_id: Medicament ID
         
     Returns:
-        Optional[Medicament]: Medicament or None
+        Optional[RowMapping]: Medicament row or None
     """
     result = await db.execute(
-        select(Medicament).where(
+        select(*_columns()).where(
             and_(
                 Medicament.id == medicament_id,
                 Medicament.deleted == False
             )
         )
     )
-    return result.scalar_one_or_none()
+    return result.mappings().one_or_none()
 
 
+def _columns(fields: Optional[Sequence[str]] = None) -> list:
+    """
+    Medicament columns to select for the given output fields.
+    
+    Args:
+        fields: Output field names (defaults to every MedicamentOut field);
+            `id` is always selected
+        
+    Returns:
+        list: Column expressions
+    """
+    names = dict.fromkeys(["id", *(fields or MEDICAMENT_FIELDS)])
+    return [Medicament.__table__.c[name] for name in names if name in Medicament.__table__.c]
+
+
+# Search filters: name -> condition on the bound parameter holding its value
+_FILTER_CONDITIONS = {
+    "q": lambda value: or_(Medicament.dci.ilike(value), Medicament.nom_marque.ilike(value)),
+    "dci": lambda value: Medicament.dci.ilike(value),
+    "nom_marque": lambda value: Medicament.nom_marque.ilike(value),
+    "code": lambda value: Medicament.code.ilike(value),
+    "laboratoire": lambda value: Medicament.laboratoire.ilike(value),
+    "pays_laboratoire": lambda value: Medicament.pays_laboratoire.ilike(value),
+    "liste": lambda value: Medicament.liste == value,
+    "type_medicament": lambda value: Medicament.type_medicament == value,
+    "statut": lambda value: Medicament.statut == value,
+    "date_initial_min": lambda value: Medicament.date_enregistrement_initial >= value,
+    "date_initial_max": lambda value: Medicament.date_enregistrement_initial <= value,
+    "version": lambda value: Medicament.version_nomenclature == value,
+}
+
+# Filters matched as a case-insensitive substring
+_SUBSTRING_FILTERS = {"q", "dci", "nom_marque", "code", "laboratoire", "pays_laboratoire"}
+
+
+def _filter_params(**filters) -> dict:
+    """
+    Bound parameter values of the search filters that are set.
+    
+    Args:
+        **filters: Same filters as get_medicaments (unset ones are skipped)
+        
+    Returns:
+        dict: Filter name -> value, in _FILTER_CONDITIONS order
+    """
+    return {
+        name: f"%{filters[name]}%" if name in _SUBSTRING_FILTERS else filters[name]
+        for name in _FILTER_CONDITIONS
+        if filters.get(name)
+    }
+
+
+def _build_filters(**filters) -> list:
+    """
+    Build the WHERE conditions for the medicament search filters.
+    
+    Args:
+        **filters: Same filters as get_medicaments
+        
+    Returns:
+        list: SQLAlchemy conditions to combine with AND
+    """
+    return [
+        _FILTER_CONDITIONS[name](bindparam(name, value))
+        for name, value in _filter_params(**filters).items()
+    ]
+
+
+@lru_cache(maxsize=256)
+def _list_statements(filter_names: tuple, fields: Optional[tuple]) -> tuple:
+    """
+    Count and page statements of get_medicaments for a filter combination.
+    
+    Filter values, offset and limit are left as bound parameters, so one
+    pair of statements serves every request with the same filters and
+    fields. Reusing the statement objects skips their construction and
+    cache key generation; SQLAlchemy then finds the compiled form in its
+    compiled cache.
+    
+    Args:
+        filter_names: Names of the filters that are set
+        fields: Columns to select (None for every MedicamentOut field)
+        
+    Returns:
+        tuple: (count statement, page statement)
+    """
+    conditions = [
+        Medicament.deleted == False,
+        *(_FILTER_CONDITIONS[name](bindparam(name)) for name in filter_names)
+    ]
+    count_query = select(func.count(Medicament.id)).where(*conditions)
+    query = (
+        select(*_columns(fields))
+        .where(*conditions)
+        .offset(bindparam("offset", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+    )
+    return count_query, query
+
+
+@response_cache.cached("medicaments")
 async def get_medicaments(
     db: AsyncSession,
     page: int = 1,
@@ -45,11 +165,15 @@ async def get_medicaments(
     statut: Optional[str] = None,
     date_initial_min: Optional[date] = None,
     date_initial_max: Optional[date] = None,
-    version: Optional[str] = None
-) -> tuple[List[Medicament], int]:
+    version: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
+) -> tuple[List[RowMapping], int]:
     """
     Get paginated and filtered list of medicaments.
     
+    Rows are selected as plain column mappings rather than ORM entities so
+    list endpoints can validate and serialize them in bulk.
+    
     Args:
         db: Database session
         page: Page number (1-indexed)
@@ -66,70 +190,189 @@ async def get_medicaments(
         date_initial_min: Minimum date_enregistrement_initial
         date_initial_max: Maximum date_enregistrement_initial
         version: Filter by version_nomenclature
+        fields: Columns to select (defaults to every MedicamentOut field)
         
     Returns:
-        tuple[List[Medicament], int]: List of medicaments and total count
+        tuple[List[RowMapping], int]: List of medicament rows and total count
     """
-    # Base query - exclude deleted
-    query = select(Medicament).where(Medicament.deleted == False)
-    
-    # Apply filters
-    if q:
-        search_pattern = f"%{q}%"
-        query = query.where(
-            or_(
-                Medicament.dci.ilike(search_pattern),
-                Medicament.nom_marque.ilike(search_pattern)
-            )
-        )
-    
-    if dci:
-        query = query.where(Medicament.dci.ilike(f"%{dci}%"))
+    params = _filter_params(
+        q=q,
+        dci=dci,
+        nom_marque=nom_marque,
+        code=code,
+        laboratoire=laboratoire,
+        pays_laboratoire=pays_laboratoire,
+        liste=liste,
+        type_medicament=type_medicament,
+        statut=statut,
+        date_initial_min=date_initial_min,
+        date_initial_max=date_initial_max,
+        version=version
+    )
+    count_query, query = _list_statements(tuple(params), tuple(fields) if fields else None)
     
-    if nom_marque:
-        query = query.where(Medicament.nom_marque.ilike(f"%{nom_marque}%"))
+    # Get total count
+    total_result = await db.execute(count_query, params)
+    total = total_result.scalar()
     
-    if code:
-        query = query.where(Medicament.code.ilike(f"%{code}%"))
+    # Apply pagination
+    result = await db.execute(
+        query,
+        {**params, "offset": (page - 1) * page_size, "limit": page_size}
+    )
+    return list(result.mappings().all()), total
+
+
+async def stream_medicaments(
+    db: AsyncSession,
+    fields: Optional[Sequence[str]] = None,
+    chunk_size: int = 1000,
+    **filters
+) -> AsyncIterator[List[RowMapping]]:
+    """
+    Stream every medicament matching the filters, chunk by chunk.
     
-    if laboratoire:
-        query = query.where(Medicament.laboratoire.ilike(f"%{laboratoire}%"))
+    Uses a server-side cursor so only one chunk is held in memory.
     
-    if pays_laboratoire:
-        query = query.where(Medicament.pays_laboratoire.ilike(f"%{pays_laboratoire}%"))
+    Args:
+        db: Database session (must stay open while iterating)
+        fields: Columns to select (defaults to every MedicamentOut field)
+        chunk_size: Rows fetched per round trip
+        **filters: Same filters as get_medicaments
+        
+    Yields:
+        List[RowMapping]: Chunks of medicament rows
+    """
+    query = (
+        select(*_columns(fields))
+        .where(Medicament.deleted == False, *_build_filters(**filters))
+        .order_by(Medicament.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await db.stream(query)
+    async for rows in result.mappings().partitions():
+        yield rows
+
+
+async def search_medicaments(
+    db: AsyncSession,
+    q: str,
+    page: int = 1,
+    page_size: int = 50,
+    fields: Optional[Sequence[str]] = None,
+    **filters
+) -> tuple[List[tuple[RowMapping, float]], int]:
+    """
+    Ranked fuzzy search on DCI and nom_marque, tolerant to typos.
     
-    if liste:
-        query = query.where(Medicament.liste == liste)
+    The other filters are resolved in SQL to a set of ids first; the search
+    index then ranks every matching candidate in memory and only the
+    requested page is sorted and loaded.
     
-    if type_medicament:
-        query = query.where(Medicament.type_medicament == type_medicament)
+    Args:
+        db: Database session
+        q: Free-text query
+        page: Page number (1-indexed)
+        page_size: Items per page
+        fields: Columns to select (defaults to every MedicamentOut field)
+        **filters: Other get_medicaments filters (except q)
+        
+    Returns:
+        tuple[List[tuple[RowMapping, float]], int]: (medicament row, score) pairs
+        in relevance order and total count of matches
+    """
+    # Restrict candidates to the filtered set before ranking, so matches
+    # are never cut off before the filters apply
+    allowed = None
+    conditions = _build_filters(**filters)
+    if conditions:
+        result = await db.execute(
+            select(Medicament.id).where(Medicament.deleted == False, *conditions)
+        )
+        allowed = set(result.scalars().all())
     
-    if statut:
-        query = query.where(Medicament.statut == statut)
+    offset = (page - 1) * page_size
+    ranked, total = await search_index.search(db, q, limit=offset + page_size, allowed=allowed)
+    page_ranked = ranked[offset:]
+    if not page_ranked:
+        return [], total
     
-    if date_initial_min:
-        query = query.where(Medicament.date_enregistrement_initial >= date_initial_min)
+    result = await db.execute(
+        select(*_columns(fields)).where(
+            Medicament.id.in_([medicament_id for medicament_id, _ in page_ranked]),
+            Medicament.deleted == False
+        )
+    )
+    by_id = {row["id"]: row for row in result.mappings().all()}
     
-    if date_initial_max:
-        query = query.where(Medicament.date_enregistrement_initial <= date_initial_max)
+    return [
+        (by_id[medicament_id], score)
+        for medicament_id, score in page_ranked
+        if medicament_id in by_id
+    ], total
+
+
+async def lookup_medicaments(
+    db: AsyncSession,
+    ids: List[int],
+    codes: List[str],
+    num_enregistrements: List[str],
+    version: Optional[str] = None
+) -> tuple[List[Medicament], dict]:
+    """
+    Resolve many medicaments by id, code or num_enregistrement in one query.
     
-    if version:
-        query = query.where(Medicament.version_nomenclature == version)
+    Args:
+        db: Database session
+        ids: Medicament IDs
+        codes: Medicament codes
+        num_enregistrements: Registration numbers
+        version: Optional version_nomenclature restricting code/num_enregistrement matches
+        
+    Returns:
+        tuple[List[Medicament], dict]: Matching medicaments and the keys that
+        matched nothing, per key type
+    """
+    ids = list(dict.fromkeys(ids))
+    codes = list(dict.fromkeys(codes))
+    num_enregistrements = list(dict.fromkeys(num_enregistrements))
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    key_conditions = []
+    if ids:
+        key_conditions.append(Medicament.id.in_(ids))
+    if codes:
+        key_conditions.append(Medicament.code.in_(codes))
+    if num_enregistrements:
+        key_conditions.append(Medicament.num_enregistrement.in_(num_enregistrements))
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    medicaments = []
+    if key_conditions:
+        query = select(Medicament).where(Medicament.deleted == False, or_(*key_conditions))
+        if version:
+            query = query.where(
+                or_(
+                    Medicament.id.in_(ids),
+                    Medicament.version_nomenclature == version
+                )
+            )
+        result = await db.execute(query.order_by(Medicament.id))
+        medicaments = list(result.scalars().all())
     
-    # Execute query
-    result = await db.execute(query)
-    medicaments = result.scalars().all()
+    # Rows pulled in by id may belong to another version: they don't resolve codes
+    in_version = [
+        medicament for medicament in medicaments
+        if not version or medicament.version_nomenclature == version
+    ]
+    found_ids = {medicament.id for medicament in medicaments}
+    found_codes = {medicament.code for medicament in in_version}
+    found_nums = {medicament.num_enregistrement for medicament in in_version}
     
-    return list(medicaments), total
+    not_found = {
+        "ids": [key for key in ids if key not in found_ids],
+        "codes": [key for key in codes if key not in found_codes],
+        "num_enregistrements": [key for key in num_enregistrements if key not in found_nums]
+    }
+    return medicaments, not_found
 
 
 async def create_medicament(db: AsyncSession, medicament: MedicamentCreate) -> Medicament:
@@ -145,6 +388,9 @@ async def create_medicament(db: AsyncSession, medicament: MedicamentCreate) -> M
     """
     db_medicament = Medicament(**medicament.model_dump())
     db.add(db_medicament)
+    await _apply_statistics_deltas(db, _statistics_deltas(db_medicament, +1))
+    await record_history(db, db_medicament, "create")
+    await data_version.bump(db)
     await db.commit()
     await db.refresh(db_medicament)
     return db_medicament
@@ -154,36 +400,82 @@ async def update_medicament(
     db: AsyncSession,
     medicament_id: int,
     medicament_update: MedicamentUpdate
-) -> Optional[Medicament]:
+) -> Optional[RowMapping]:
     """
     Update a medicament.
     
+    The row is updated and read back with a single UPDATE ... RETURNING.
+    When a statistics dimension changes, the replaced values are read in
+    the same statement on PostgreSQL (self-join on the pre-update row) and
+    with a preliminary SELECT elsewhere.
+    
     Args:
         db: Database session
         medicament_id: Medicament ID
         medicament_update: Update data
         
     Returns:
-        Optional[Medicament]: Updated medicament or None
+        Optional[RowMapping]: Updated medicament row or None
     """
-    db_medicament = await get_medicament_by_id(db, medicament_id)
-    if not db_medicament:
-        return None
-    
-    # Update fields
+    table = Medicament.__table__
     update_data = medicament_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_medicament, field, value)
+    dimensions = {
+        dimension: table.c[column.key]
+        for dimension, column in STATISTICS_DIMENSIONS.items()
+        if column.key in update_data
+    }
     
+    statement = (
+        update(table)
+        .where(table.c.id == medicament_id, table.c.deleted == False)
+        .values(**update_data, updated_at=datetime.utcnow())
+        .returning(*_columns())
+    )
+    
+    previous = {}
+    if dimensions and db.get_bind().dialect.name == "postgresql":
+        old = (
+            select(table.c.id, *[column.label(dimension) for dimension, column in dimensions.items()])
+            .where(table.c.id == medicament_id)
+            .with_for_update()
+            .subquery("old")
+        )
+        statement = statement.where(table.c.id == old.c.id).returning(
+            *[old.c[dimension].label(f"old_{dimension}") for dimension in dimensions]
+        )
+    elif dimensions:
+        result = await db.execute(
+            select(*[column.label(f"old_{dimension}") for dimension, column in dimensions.items()])
+            .where(table.c.id == medicament_id, table.c.deleted == False)
+        )
+        previous = result.mappings().one_or_none() or {}
+    
+    result = await db.execute(statement)
+    row = result.mappings().one_or_none()
+    if row is None:
+        return None
+    
+    deltas = Counter()
+    for dimension in dimensions:
+        old_value = row.get(f"old_{dimension}", previous.get(f"old_{dimension}"))
+        new_value = row[STATISTICS_DIMENSIONS[dimension].key]
+        if old_value != new_value:
+            deltas[dimension, old_value] -= 1
+            deltas[dimension, new_value] += 1
+    await _apply_statistics_deltas(db, deltas)
+    await record_history(db, row, "update")
+    await data_version.bump(db)
     await db.commit()
-    await db.refresh(db_medicament)
-    return db_medicament
+    return row
 
 
 async def delete_medicament(db: AsyncSession, medicament_id: int) -> bool:
     """
     Soft delete a medicament (set deleted = True).
     
+    The row is flagged and read back (for statistics and history) with a
+    single UPDATE ... RETURNING.
+    
     Args:
         db: Database session
         medicament_id: Medicament ID
@@ -191,51 +483,368 @@ async def delete_medicament(db: AsyncSession, medicament_id: int) -> bool:
     Returns:
         bool: True if deleted, False if not found
     """
-    db_medicament = await get_medicament_by_id(db, medicament_id)
-    if not db_medicament:
+    table = Medicament.__table__
+    result = await db.execute(
+        update(table)
+        .where(table.c.id == medicament_id, table.c.deleted == False)
+        .values(deleted=True, updated_at=datetime.utcnow())
+        .returning(*_columns())
+    )
+    row = result.mappings().one_or_none()
+    if row is None:
         return False
     
-    db_medicament.deleted = True
+    await _apply_statistics_deltas(db, _statistics_deltas(row, -1))
+    await record_history(db, row, "delete")
+    await data_version.bump(db)
     await db.commit()
     return True
 
 
-async def get_statistics(db: AsyncSession) -> dict:
+async def bulk_write_medicaments(db: AsyncSession, operations: List[BulkOperation]) -> List[dict]:
     """
-    Get medicament statistics.
+    Apply a batch of create, update and delete operations in one transaction.
+    
+    Operations are resolved in order against the rows loaded by a single
+    SELECT, then written with one statement per kind (multi-row INSERT,
+    executemany UPDATE, UPDATE ... WHERE id IN), plus the statistics and
+    history writes. Updates and deletes of missing or deleted medicaments
+    fail individually without aborting the batch.
     
     Args:
         db: Database session
+        operations: Bulk operations, applied in order
         
     Returns:
-        dict: Statistics grouped by laboratory, country, and type
+        List[dict]: Per-operation results (index, op, status, id, item, error)
+    """
+    table = Medicament.__table__
+    now = datetime.utcnow()
+    
+    target_ids = {operation.id for operation in operations if not isinstance(operation, BulkCreate)}
+    state = {}
+    if target_ids:
+        result = await db.execute(
+            select(*_columns()).where(Medicament.id.in_(target_ids), Medicament.deleted == False)
+        )
+        state = {row["id"]: dict(row) for row in result.mappings().all()}
+    
+    results: List[dict] = []
+    creates: List[tuple[int, dict]] = []
+    updated_ids: dict = {}
+    deleted_ids: dict = {}
+    statistics = Counter()
+    history = []
+    
+    for index, operation in enumerate(operations):
+        if isinstance(operation, BulkCreate):
+            values = {**operation.data.model_dump(), "created_at": now, "updated_at": now}
+            creates.append((index, values))
+            results.append({"index": index, "op": "create", "status": 201})
+            continue
+        
+        row = state.get(operation.id)
+        if row is None or operation.id in deleted_ids:
+            results.append({
+                "index": index,
+                "op": operation.op,
+                "status": 404,
+                "id": operation.id,
+                "error": "Medicament not found"
+            })
+            continue
+        
+        for dimension, value in _statistics_values(row).items():
+            statistics[dimension, value] -= 1
+        if isinstance(operation, BulkUpdate):
+            row.update(operation.data.model_dump(exclude_unset=True), updated_at=now)
+            for dimension, value in _statistics_values(row).items():
+                statistics[dimension, value] += 1
+            updated_ids[operation.id] = None
+            results.append({"index": index, "op": "update", "status": 200, "id": operation.id, "item": dict(row)})
+        else:
+            deleted_ids[operation.id] = None
+            results.append({"index": index, "op": "delete", "status": 204, "id": operation.id})
+        history.append(snapshot_row(row, operation.op, now))
+    
+    if creates:
+        result = await db.execute(
+            insert(table).returning(*_columns(), sort_by_parameter_order=True),
+            [values for _, values in creates]
+        )
+        for (index, _), row in zip(creates, result.mappings().all()):
+            results[index].update(id=row["id"], item=dict(row))
+            for dimension, value in _statistics_values(row).items():
+                statistics[dimension, value] += 1
+            history.append(snapshot_row(row, "create", now))
+    
+    rows = [
+        {"b_id": medicament_id, **{key: value for key, value in state[medicament_id].items() if key != "id"}}
+        for medicament_id in updated_ids
+    ]
+    if rows:
+        await db.execute(update(table).where(table.c.id == bindparam("b_id")), rows)
+    if deleted_ids:
+        await db.execute(
+            update(table).where(table.c.id.in_(list(deleted_ids))).values(deleted=True, updated_at=now)
+        )
+    
+    if history:
+        await _apply_statistics_deltas(db, statistics)
+        await db.execute(insert(MedicamentHistory), history)
+        await data_version.bump(db)
+        await db.commit()
+    
+    return results
+
+
+async def grouped_counts(
+    db: AsyncSession,
+    columns: dict,
+    conditions: Sequence = ()
+) -> dict[str, dict[str, int]]:
+    """
+    Count medicaments per value of several columns in a single scan.
+    
+    PostgreSQL computes all groupings at once with GROUPING SETS; other
+    databases group by the combination of columns and the per-column
+    counts are summed in Python.
+    
+    Args:
+        db: Database session
+        columns: Result name -> column to group by
+        conditions: WHERE conditions
+        
+    Returns:
+        dict[str, dict[str, int]]: Counts per value, for each result name
     """
-    # Count by laboratoire
-    lab_query = select(
-        Medicament.laboratoire,
-        func.count(Medicament.id).label('count')
-    ).where(Medicament.deleted == False).group_by(Medicament.laboratoire)
-    lab_result = await db.execute(lab_query)
-    par_laboratoire = {row[0]: row[1] for row in lab_result.all()}
-    
-    # Count by pays
-    pays_query = select(
-        Medicament.pays_laboratoire,
-        func.count(Medicament.id).label('count')
-    ).where(Medicament.deleted == False).group_by(Medicament.pays_laboratoire)
-    pays_result = await db.execute(pays_query)
-    par_pays = {row[0]: row[1] for row in pays_result.all()}
-    
-    # Count by type
-    type_query = select(
-        Medicament.type_medicament,
-        func.count(Medicament.id).label('count')
-    ).where(Medicament.deleted == False).group_by(Medicament.type_medicament)
-    type_result = await db.execute(type_query)
-    par_type = {row[0]: row[1] for row in type_result.all()}
+    names = list(columns)
+    cols = [columns[name] for name in names]
+    counts: dict[str, dict] = {name: {} for name in names}
+    if not cols:
+        return counts
+    
+    if db.get_bind().dialect.name == "postgresql":
+        query = select(
+            *cols,
+            *[func.grouping(col) for col in cols],
+            func.count(Medicament.id)
+        ).where(*conditions).group_by(func.grouping_sets(*cols))
+        result = await db.execute(query)
+        for row in result.all():
+            values, flags, count = row[:len(cols)], row[len(cols):-1], row[-1]
+            # GROUPING(col) is 0 for the column this row is grouped by
+            index = list(flags).index(0)
+            counts[names[index]][values[index]] = count
+    else:
+        query = select(*cols, func.count(Medicament.id)).where(*conditions).group_by(*cols)
+        result = await db.execute(query)
+        for row in result.all():
+            for index, name in enumerate(names):
+                bucket = counts[name]
+                bucket[row[index]] = bucket.get(row[index], 0) + row[-1]
     
+    return counts
+
+
+@response_cache.cached("facets")
+async def get_facets(
+    db: AsyncSession,
+    facets: Sequence[str],
+    **filters
+) -> dict[str, dict[str, int]]:
+    """
+    Count matching medicaments per value of each facet, in one aggregate query.
+    
+    Args:
+        db: Database session
+        facets: Medicament columns to count by
+        **filters: Same filters as get_medicaments
+        
+    Returns:
+        dict[str, dict[str, int]]: Counts per value for each facet (null values omitted)
+    """
+    counts = await grouped_counts(
+        db,
+        {facet: getattr(Medicament, facet) for facet in facets},
+        [Medicament.deleted == False, *_build_filters(**filters)]
+    )
     return {
-        "par_laboratoire": par_laboratoire,
-        "par_pays": par_pays,
-        "par_type": par_type
+        facet: {value: count for value, count in values.items() if value is not None}
+        for facet, values in counts.items()
     }
+
+
+# Statistics dimensions and the column each one counts
+STATISTICS_DIMENSIONS = {
+    "par_laboratoire": Medicament.laboratoire,
+    "par_pays": Medicament.pays_laboratoire,
+    "par_type": Medicament.type_medicament,
+}
+
+# Row written by every full refresh: marks the statistics as built, even
+# for an empty catalogue (CRUD deltas alone never create it)
+STATISTICS_BUILT = {"dimension": "_built", "value": "", "count": 1}
+
+# Advisory lock key serializing the initial statistics build across workers (PostgreSQL)
+STATISTICS_LOCK_ID = 5_230_139
+
+
+async def refresh_statistics(db: AsyncSession) -> None:
+    """
+    Recompute the materialized statistics in one pass over the catalogue.
+    
+    Runs inside the caller's transaction; the caller commits.
+    
+    Args:
+        db: Database session
+    """
+    counts = await grouped_counts(db, STATISTICS_DIMENSIONS, [Medicament.deleted == False])
+    await db.execute(delete(MedicamentStatistic))
+    rows = [
+        {"dimension": dimension, "value": value, "count": count}
+        for dimension, values in counts.items()
+        for value, count in values.items()
+        if value is not None
+    ]
+    rows.append(STATISTICS_BUILT)
+    await db.execute(_statistics_upsert(db, accumulate=False), rows)
+
+
+async def ensure_statistics(db: AsyncSession) -> bool:
+    """
+    Build the materialized statistics if they have never been built.
+    
+    Runs in every worker's startup, before any write: CRUD writes only
+    apply deltas, which are wrong on a table that was never filled from
+    the catalogue. The check and the build happen under a lock, so only
+    the first worker builds.
+    
+    Args:
+        db: Database session (without an open transaction)
+        
+    Returns:
+        bool: True if this call built the statistics
+    """
+    try:
+        await lock_for_seeding(db, STATISTICS_LOCK_ID, MedicamentStatistic)
+    except OperationalError:
+        # SQLite busy timeout: another worker holds the lock while building
+        await db.rollback()
+        return False
+    
+    result = await db.execute(
+        select(MedicamentStatistic.count).where(
+            MedicamentStatistic.dimension == STATISTICS_BUILT["dimension"],
+            MedicamentStatistic.value == STATISTICS_BUILT["value"]
+        )
+    )
+    if result.scalar_one_or_none() is not None:
+        await db.rollback()
+        return False
+    
+    await refresh_statistics(db)
+    await db.commit()
+    return True
+
+
+def _statistics_upsert(db: AsyncSession, accumulate: bool):
+    """
+    INSERT ... ON CONFLICT (dimension, value) statement for statistics rows.
+    
+    PostgreSQL and SQLite share the syntax; the dialect's insert construct
+    is picked from the session's bind.
+    
+    Args:
+        db: Database session
+        accumulate: Add the inserted count to an existing bucket (True) or
+            overwrite it (False)
+        
+    Returns:
+        Insert: Statement to execute with a list of row values
+    """
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    table = MedicamentStatistic.__table__
+    statement = dialect_insert(table)
+    count = table.c.count + statement.excluded.count if accumulate else statement.excluded.count
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.dimension, table.c.value],
+        set_={"count": count}
+    )
+
+
+def _statistics_values(medicament) -> dict[str, str]:
+    """Value of each statistics dimension for a medicament entity or row mapping."""
+    if isinstance(medicament, Medicament):
+        return {
+            dimension: getattr(medicament, column.key)
+            for dimension, column in STATISTICS_DIMENSIONS.items()
+        }
+    return {
+        dimension: medicament[column.key]
+        for dimension, column in STATISTICS_DIMENSIONS.items()
+    }
+
+
+def _statistics_deltas(medicament, delta: int) -> Counter:
+    """Statistics deltas for adding (+1) or removing (-1) a medicament."""
+    return Counter({
+        (dimension, value): delta
+        for dimension, value in _statistics_values(medicament).items()
+    })
+
+
+async def _apply_statistics_deltas(db: AsyncSession, deltas: Counter) -> None:
+    """
+    Add many count deltas to the materialized statistics.
+    
+    A single upsert creates missing buckets and increments existing ones,
+    so concurrent writes introducing the same value don't collide. Runs
+    inside the caller's transaction. Buckets that drop to zero are kept
+    (get_statistics skips them) until the next full refresh, which saves
+    a DELETE per write.
+    
+    Args:
+        db: Database session
+        deltas: (dimension, value) -> count change
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta and key[1] is not None}
+    if not deltas:
+        return
+    
+    rows = [
+        {"dimension": dimension, "value": value, "count": delta}
+        for (dimension, value), delta in deltas.items()
+    ]
+    await db.execute(_statistics_upsert(db, accumulate=True), rows)
+
+
+@response_cache.cached("statistics")
+async def get_statistics(db: AsyncSession) -> dict:
+    """
+    Get medicament statistics.
+    
+    Reads the materialized statistics table, which is built at startup,
+    refreshed at the end of each import and patched by CRUD writes. If it
+    was never built (no marker row), it is built here through a write
+    session, since `db` may be a read replica.
+    
+    Args:
+        db: Database session (read-only use)
+        
+    Returns:
+        dict: Statistics grouped by laboratory, country, and type
+    """
+    statement = select(MedicamentStatistic.dimension, MedicamentStatistic.value, MedicamentStatistic.count)
+    rows = (await db.execute(statement)).all()
+    
+    if not any(row.dimension == STATISTICS_BUILT["dimension"] for row in rows):
+        async with AsyncSessionLocal() as write_db:
+            await ensure_statistics(write_db)
+            rows = (await write_db.execute(statement)).all()
+    
+    stats = {dimension: {} for dimension in STATISTICS_DIMENSIONS}
+    for dimension, value, count in rows:
+        if dimension in stats and count > 0:
+            stats[dimension][value] = count
+    return stats
@@ -0,0 +1,134 @@
+"""Version-to-version comparison of the nomenclature."""
+import hashlib
+from typing import AsyncIterator, Dict, List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.medicaments import crud
+from app.medicaments.models import Medicament
+
+# Columns describing the medicament itself (row number, version and audit fields excluded)
+CONTENT_FIELDS = (
+    "num_enregistrement",
+    "dci",
+    "nom_marque",
+    "forme",
+    "dosage",
+    "conditionnement",
+    "liste",
+    "p1",
+    "p2",
+    "obs",
+    "laboratoire",
+    "pays_laboratoire",
+    "date_enregistrement_initial",
+    "date_enregistrement_final",
+    "type_medicament",
+    "statut",
+    "duree_stabilite",
+)
+
+
+def content_hash(row) -> bytes:
+    """
+    Digest of the content columns of a medicament row.
+
+    Args:
+        row: Mapping with at least CONTENT_FIELDS
+
+    Returns:
+        bytes: 16-byte digest
+    """
+    parts = ("\x00" if row[field] is None else str(row[field]) for field in CONTENT_FIELDS)
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
+
+
+async def diff_versions(
+    db: AsyncSession,
+    from_version: str,
+    to_version: str
+) -> AsyncIterator[dict]:
+    """
+    Compare two nomenclature versions keyed on `code`, as a hash join.
+
+    The `from` version is loaded as a code -> [(content hash, id)] table;
+    the `to` version is then streamed once and probed against it, so only
+    hashes are compared and memory holds one side's digests.
+
+    A code may appear on several rows of a version (duplicates kept by
+    the import). Rows of such codes are first paired with an identical
+    row, then the rest in id order; extra rows in `to` are reported as
+    added and unpaired rows of `from` as removed, so no row is dropped.
+
+    Args:
+        db: Database session (must stay open while iterating)
+        from_version: Reference version
+        to_version: New version
+
+    Yields:
+        dict: One record per added, changed or removed medicament, then a
+        final {"summary": {...}} record with counts per change type
+    """
+    build: Dict[str, List[Tuple[bytes, int]]] = {}
+    result = await db.stream(
+        select(Medicament.id, Medicament.code, *[getattr(Medicament, field) for field in CONTENT_FIELDS])
+        .where(Medicament.version_nomenclature == from_version, Medicament.deleted == False)
+        .order_by(Medicament.id)
+        .execution_options(yield_per=1000)
+    )
+    async for rows in result.mappings().partitions():
+        for row in rows:
+            build.setdefault(row["code"], []).append((content_hash(row), row["id"]))
+
+    # Codes on several rows of either version are paired once `to` is read
+    result = await db.execute(
+        select(Medicament.code)
+        .where(Medicament.version_nomenclature == to_version, Medicament.deleted == False)
+        .group_by(Medicament.code)
+        .having(func.count() > 1)
+    )
+    duplicated = set(result.scalars()) | {code for code, candidates in build.items() if len(candidates) > 1}
+    pending: List[dict] = []
+
+    summary = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+    async for rows in crud.stream_medicaments(db, version=to_version):
+        for row in rows:
+            candidates = build.get(row["code"])
+            if row["code"] in duplicated:
+                digest = content_hash(row)
+                index = next((i for i, (previous, _) in enumerate(candidates or ()) if previous == digest), None)
+                if index is None:
+                    pending.append(dict(row))
+                else:
+                    del candidates[index]
+                    summary["unchanged"] += 1
+            elif not candidates:
+                summary["added"] += 1
+                yield {"change": "added", "code": row["code"], "item": dict(row)}
+            else:
+                previous, from_id = candidates.pop()
+                if previous != content_hash(row):
+                    summary["changed"] += 1
+                    yield {"change": "changed", "code": row["code"], "from_id": from_id, "item": dict(row)}
+                else:
+                    summary["unchanged"] += 1
+
+    # Rows of duplicated codes without an identical counterpart, in id order
+    for item in pending:
+        candidates = build.get(item["code"])
+        if candidates:
+            _, from_id = candidates.pop(0)
+            summary["changed"] += 1
+            yield {"change": "changed", "code": item["code"], "from_id": from_id, "item": item}
+        else:
+            summary["added"] += 1
+            yield {"change": "added", "code": item["code"], "item": item}
+
+    # Rows never paired with a row of the new version were removed
+    for code, candidates in build.items():
+        for _, medicament_id in candidates:
+            summary["removed"] += 1
+            yield {"change": "removed", "code": code, "from_id": medicament_id}
+
+    yield {"summary": summary}
@@ -0,0 +1,225 @@
+"""Temporal history of medicaments (append-only snapshots and as-of queries)."""
+import json
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from pydantic_core import to_json
+from sqlalchemy import select, func, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.locks import lock_for_seeding
+from app.medicaments.models import Medicament, MedicamentHistory
+from app.medicaments.schemas import MEDICAMENT_FIELDS
+
+# Rows inserted per statement when backfilling the baseline
+BASELINE_CHUNK_SIZE = 1000
+
+# Advisory lock key serializing baseline seeding across workers (PostgreSQL)
+BASELINE_LOCK_ID = 5_230_138
+
+
+def snapshot_row(medicament, operation: str, valid_from: datetime) -> dict:
+    """
+    Build a history row from a medicament entity or row mapping.
+
+    Args:
+        medicament: Medicament entity or mapping with MEDICAMENT_FIELDS
+        operation: Kind of write that produced this state
+        valid_from: Time from which this state is valid
+
+    Returns:
+        dict: Values for an INSERT into medicament_history
+    """
+    if isinstance(medicament, Medicament):
+        values = {field: getattr(medicament, field) for field in MEDICAMENT_FIELDS}
+    else:
+        values = {field: medicament[field] for field in MEDICAMENT_FIELDS}
+    return {
+        "medicament_id": values["id"],
+        "code": values["code"],
+        "version_nomenclature": values["version_nomenclature"],
+        "operation": operation,
+        "valid_from": valid_from,
+        "data": to_json(values).decode("utf-8"),
+    }
+
+
+class HistoryRecorder:
+    """
+    Collects medicaments written in a transaction and appends their
+    snapshots with a single multi-row INSERT.
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[Medicament, str]] = []
+
+    def add(self, medicament: Medicament, operation: str) -> None:
+        """Queue a written medicament for the next flush."""
+        self._pending.append((medicament, operation))
+
+    async def flush(self, db: AsyncSession) -> None:
+        """
+        Insert snapshots of the queued medicaments (call before committing).
+
+        Args:
+            db: Database session carrying the writes
+        """
+        if not self._pending:
+            return
+        # New entities need their primary key and defaults
+        await db.flush()
+        now = datetime.utcnow()
+        rows = [snapshot_row(medicament, operation, now) for medicament, operation in self._pending]
+        await db.execute(insert(MedicamentHistory), rows)
+        self._pending.clear()
+
+
+async def record_history(db: AsyncSession, medicament: Medicament, operation: str) -> None:
+    """
+    Append the snapshot of a single written medicament.
+
+    Args:
+        db: Database session carrying the write
+        medicament: Written medicament (entity or row mapping)
+        operation: create, update or delete
+    """
+    recorder = HistoryRecorder()
+    recorder.add(medicament, operation)
+    await recorder.flush(db)
+
+
+async def ensure_baseline(db: AsyncSession) -> int:
+    """
+    Seed the history with the current catalogue when it is empty.
+
+    Rows that existed before history tracking get a `baseline` snapshot
+    valid from their last update, so as-of queries cover them. Runs in
+    every worker's startup: the check and the seeding happen under a
+    lock, so only the first worker writes the baseline.
+
+    Args:
+        db: Database session (without an open transaction)
+
+    Returns:
+        int: Number of baseline snapshots written
+    """
+    try:
+        await lock_for_seeding(db, BASELINE_LOCK_ID, MedicamentHistory)
+    except OperationalError:
+        # SQLite busy timeout: another worker holds the lock while seeding
+        await db.rollback()
+        return 0
+
+    result = await db.execute(select(MedicamentHistory.id).limit(1))
+    if result.scalar_one_or_none() is not None:
+        await db.rollback()
+        return 0
+
+    written = 0
+    stream = await db.stream(
+        select(Medicament).where(Medicament.deleted == False).execution_options(yield_per=BASELINE_CHUNK_SIZE)
+    )
+    async for medicaments in stream.scalars().partitions():
+        rows = [snapshot_row(medicament, "baseline", medicament.updated_at) for medicament in medicaments]
+        await db.execute(insert(MedicamentHistory), rows)
+        written += len(rows)
+    await db.commit()
+    return written
+
+
+async def get_history(db: AsyncSession, medicament_id: int) -> Optional[List[dict]]:
+    """
+    Get every recorded state of a medicament's code, oldest first.
+
+    Args:
+        db: Database session
+        medicament_id: Medicament ID (deleted medicaments included)
+
+    Returns:
+        Optional[List[dict]]: History entries with decoded snapshots, or None if the medicament doesn't exist
+    """
+    result = await db.execute(select(Medicament.code).where(Medicament.id == medicament_id))
+    code = result.scalar_one_or_none()
+    if code is None:
+        return None
+
+    result = await db.execute(
+        select(MedicamentHistory)
+        .where(MedicamentHistory.code == code)
+        .order_by(MedicamentHistory.valid_from, MedicamentHistory.id)
+    )
+    return [
+        {
+            "id": entry.id,
+            "medicament_id": entry.medicament_id,
+            "operation": entry.operation,
+            "valid_from": entry.valid_from,
+            "snapshot": json.loads(entry.data),
+        }
+        for entry in result.scalars().all()
+    ]
+
+
+async def get_medicaments_as_of(
+    db: AsyncSession,
+    as_of: date,
+    page: int = 1,
+    page_size: int = 50,
+    version: Optional[str] = None
+) -> tuple[List[dict], int]:
+    """
+    Get the catalogue as it was at the end of a given day.
+
+    The query is driven by medicament ids in order: for each medicament
+    a correlated `ORDER BY valid_from DESC
+    LIMIT 1` seeks its latest snapshot on the (medicament_id, valid_from)
+    index; a page only touches the index ranges of the medicaments it
+    walks instead of grouping the whole history. Medicaments whose latest
+    state is a deletion are left out.
+
+    Args:
+        db: Database session
+        as_of: Day whose end state is wanted
+        page: Page number (1-indexed)
+        page_size: Items per page
+        version: Optional version_nomenclature filter (on the snapshot)
+
+    Returns:
+        tuple[List[dict], int]: Medicament snapshots and total count
+    """
+    cutoff = datetime.combine(as_of + timedelta(days=1), time.min)
+
+    latest_id = (
+        select(MedicamentHistory.id)
+        .where(
+            MedicamentHistory.medicament_id == Medicament.id,
+            MedicamentHistory.valid_from < cutoff
+        )
+        .order_by(MedicamentHistory.valid_from.desc(), MedicamentHistory.id.desc())
+        .limit(1)
+        .correlate(Medicament)
+        .scalar_subquery()
+    )
+    conditions = [MedicamentHistory.operation != "delete"]
+    if version:
+        conditions.append(MedicamentHistory.version_nomenclature == version)
+
+    total_result = await db.execute(
+        select(func.count())
+        .select_from(Medicament)
+        .join(MedicamentHistory, MedicamentHistory.id == latest_id)
+        .where(*conditions)
+    )
+    total = total_result.scalar()
+
+    result = await db.execute(
+        select(MedicamentHistory.data)
+        .select_from(Medicament)
+        .join(MedicamentHistory, MedicamentHistory.id == latest_id)
+        .where(*conditions)
+        .order_by(Medicament.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    return [json.loads(data) for data in result.scalars().all()], total
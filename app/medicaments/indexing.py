@@ -0,0 +1,53 @@
+"""Base class for in-memory indexes derived from the medicament catalogue."""
+import asyncio
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.data_version import data_version
+
+
+class CatalogueIndex:
+    """
+    In-memory structure built lazily from the active catalogue.
+
+    Subclasses implement `_load`. The structure remembers the data version
+    it was built from and is rebuilt on the next lookup once that version
+    moves, whichever worker made the write.
+    """
+
+    def __init__(self):
+        self._data: Any = None
+        self._version: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """
+        Rebuild the index from the database.
+
+        Args:
+            db: Database session
+        """
+        # Read the version first: a write landing during the load moves it again
+        version = await data_version.current(db)
+        self._data = await self._load(db)
+        self._version = version
+
+    async def ensure(self, db: AsyncSession) -> Any:
+        """
+        Get the index data, rebuilding it first if the data version moved.
+
+        Args:
+            db: Database session (used only when the index must be rebuilt)
+
+        Returns:
+            Any: Index data produced by `_load`
+        """
+        if await data_version.current(db) != self._version:
+            async with self._lock:
+                if await data_version.current(db) != self._version:
+                    await self.rebuild(db)
+        return self._data
+
+    async def _load(self, db: AsyncSession) -> Any:
+        raise NotImplementedError
@@ -1,6 +1,6 @@
 """Medicament database model."""
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Text, Index
 from app.db.base import Base
 
 
@@ -42,3 +42,37 @@ class Medicament(Base):
     
     def __repr__(self) -> str:
         return f"<Medicament(id={self.id}, code={self.code}, dci={self.dci}, nom_marque={self.nom_marque})>"
+
+
+class MedicamentStatistic(Base):
+    """Materialized count of active medicaments per dimension value."""
+    
+    __tablename__ = "medicament_statistics"
+    
+    dimension = Column(String(50), primary_key=True)  # par_laboratoire, par_pays, par_type
+    value = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        return f"<MedicamentStatistic(dimension={self.dimension}, value={self.value}, count={self.count})>"
+
+
+class MedicamentHistory(Base):
+    """Append-only log of medicament states, one snapshot per write."""
+    
+    __tablename__ = "medicament_history"
+    __table_args__ = (
+        Index("ix_medicament_history_code_valid_from", "code", "valid_from"),
+        Index("ix_medicament_history_medicament_valid_from", "medicament_id", "valid_from"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    medicament_id = Column(Integer, nullable=False)
+    code = Column(String(100), nullable=False)
+    version_nomenclature = Column(String(50), nullable=False)
+    operation = Column(String(20), nullable=False)  # baseline, create, update or delete
+    valid_from = Column(DateTime, nullable=False)
+    data = Column(Text, nullable=False)  # JSON snapshot of the medicament after the write
+    
+    def __repr__(self) -> str:
+        return f"<MedicamentHistory(code={self.code}, operation={self.operation}, valid_from={self.valid_from})>"
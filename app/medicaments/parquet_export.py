@@ -0,0 +1,99 @@
+"""Columnar (Parquet) export of a nomenclature version, cached on disk."""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.medicaments import crud
+from app.medicaments.models import Medicament
+from app.medicaments.schemas import MEDICAMENT_FIELDS
+
+# Low-cardinality columns stored dictionary-encoded
+DICTIONARY_COLUMNS = ("liste", "type_medicament", "statut", "pays_laboratoire")
+
+
+def _arrow_schema():
+    """Arrow schema for the export (pyarrow is only imported when exporting)."""
+    import pyarrow as pa
+
+    types = {
+        "id": pa.int64(),
+        "n": pa.int32(),
+        "date_enregistrement_initial": pa.date32(),
+        "date_enregistrement_final": pa.date32(),
+        "created_at": pa.timestamp("us"),
+        "updated_at": pa.timestamp("us"),
+    }
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        (name, types.get(name, dictionary if name in DICTIONARY_COLUMNS else pa.string()))
+        for name in MEDICAMENT_FIELDS
+    ])
+
+
+def _write_parquet(columns: dict, path: Path) -> None:
+    """Write column lists to a Parquet file atomically."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pydict(columns, schema=_arrow_schema())
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+async def get_version_parquet(db: AsyncSession, version: str) -> Optional[Path]:
+    """
+    Get the Parquet export of a nomenclature version, building it if needed.
+
+    Files are keyed by a hash of the version and a fingerprint of its live
+    rows (count and last update), so repeat downloads are served from disk
+    until the version changes. Hashing keeps versions that only differ by
+    characters unsafe in file names (e.g. "2025/06" and "2025_06") apart.
+
+    Args:
+        db: Database session
+        version: version_nomenclature to export
+
+    Returns:
+        Optional[Path]: Path of the Parquet file, or None if the version has no live rows
+    """
+    result = await db.execute(
+        select(func.count(Medicament.id), func.max(Medicament.updated_at))
+        .where(
+            Medicament.version_nomenclature == version,
+            Medicament.deleted == False
+        )
+    )
+    count, last_update = result.one()
+    if not count:
+        return None
+
+    cache_dir = Path(settings.EXPORT_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    version_key = hashlib.sha256(version.encode()).hexdigest()[:16]
+    fingerprint = hashlib.sha256(f"{version}|{count}|{last_update}".encode()).hexdigest()[:16]
+    path = cache_dir / f"medicaments-{version_key}-{fingerprint}.parquet"
+    if path.exists():
+        return path
+
+    columns = {name: [] for name in MEDICAMENT_FIELDS}
+    async for rows in crud.stream_medicaments(db, version=version):
+        for row in rows:
+            for name in MEDICAMENT_FIELDS:
+                columns[name].append(row[name])
+
+    await run_in_threadpool(_write_parquet, columns, path)
+
+    # Drop files of older states of this version
+    for stale in cache_dir.glob(f"medicaments-{version_key}-{'[0-9a-f]' * 16}.parquet"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+    return path
@@ -1,28 +1,51 @@
 """Medicaments routes."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, Literal
 from datetime import date
+import csv
+import io
+from collections import Counter
+from pydantic_core import to_json
 
 from app.medicaments.schemas import (
     MedicamentOut,
+    ScoredMedicamentOut,
     MedicamentCreate,
     MedicamentUpdate,
     PaginatedResponse,
-    MedicamentStatistics
+    MedicamentStatistics,
+    SuggestResponse,
+    Suggestion,
+    MedicamentLookupRequest,
+    MedicamentLookupResponse,
+    LookupNotFound,
+    MedicamentHistoryEntry,
+    MedicamentBulkRequest,
+    MedicamentBulkResponse,
+    MEDICAMENT_FIELDS,
+    MEDICAMENT_SUMMARY_FIELDS,
+    FACET_FIELDS,
+    medicament_fields_schema,
+    paginated_adapter,
+    item_list_adapter
 )
 from app.medicaments import crud
-from app.auth.models import User
+from app.medicaments.diff import diff_versions
+from app.medicaments.history import get_history, get_medicaments_as_of
+from app.medicaments.parquet_export import get_version_parquet
+from app.medicaments.suggest import suggest_index
+from app.auth.schemas import Principal
 from app.core.security import get_current_user, get_current_admin
-from app.db.session import get_db
+from app.core.etag import etag_guard
+from app.core.rate_limit import limit_reads, limit_exports
+from app.db.session import get_db, get_read_db, ReadSessionLocal
 
 router = APIRouter(prefix="/medicaments", tags=["Medicaments"])
 
 
-@router.get("", response_model=PaginatedResponse[MedicamentOut])
-async def list_medicaments(
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(50, ge=1, le=200, description="Items per page"),
+def medicament_filters(
     q: Optional[str] = Query(None, description="Full-text search on DCI and nom_marque"),
     dci: Optional[str] = Query(None, description="Filter by DCI"),
     nom_marque: Optional[str] = Query(None, description="Filter by nom_marque"),
@@ -34,19 +57,15 @@ async def list_medicaments(
     statut: Optional[str] = Query(None, description="Filter by statut"),
     date_initial_min: Optional[date] = Query(None, description="Minimum date_enregistrement_initial"),
     date_initial_max: Optional[date] = Query(None, description="Maximum date_enregistrement_initial"),
-    version: Optional[str] = Query(None, description="Filter by version_nomenclature"),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+    version: Optional[str] = Query(None, description="Filter by version_nomenclature")
+) -> dict:
     """
-    List and search medicaments with pagination and filters.
+    Search filters shared by the list and export endpoints.
     
-    Requires authentication (Lecteur or Admin).
+    Returns:
+        dict: Keyword arguments for crud.get_medicaments
     """
-    medicaments, total = await crud.get_medicaments(
-        db=db,
-        page=page,
-        page_size=page_size,
+    return dict(
         q=q,
         dci=dci,
         nom_marque=nom_marque,
@@ -60,19 +79,241 @@ async def list_medicaments(
         date_initial_max=date_initial_max,
         version=version
     )
+
+
+def sparse_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (id is always included)"),
+    view: Optional[Literal["summary"]] = Query(None, description="Predefined compact representation")
+) -> Optional[tuple[str, ...]]:
+    """
+    Resolve the `fields`/`view` query parameters into a sparse fieldset.
     
-    return PaginatedResponse(
-        items=medicaments,
-        total=total,
-        page=page,
-        page_size=page_size
+    Returns:
+        Optional[tuple[str, ...]]: Selected fields (always including id), or None
+        for the full representation
+        
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if view == "summary":
+        return MEDICAMENT_SUMMARY_FIELDS
+    if not fields:
+        return None
+    
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in MEDICAMENT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(MEDICAMENT_FIELDS)}"
+        )
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+@router.get("", response_model=PaginatedResponse[MedicamentOut], dependencies=[Depends(limit_reads)])
+async def list_medicaments(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=200, description="Items per page"),
+    search_mode: Literal["contains", "fuzzy"] = Query("contains", description="How q is matched: substring, or ranked typo-tolerant search"),
+    filters: dict = Depends(medicament_filters),
+    selected: Optional[tuple[str, ...]] = Depends(sparse_fields),
+    facets: Optional[str] = Query(None, description=f"Comma-separated facets to count for the current filters ({', '.join(FACET_FIELDS)})"),
+    as_of: Optional[date] = Query(None, description="Return the catalogue as it was at the end of this day (only combinable with version)"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    etag: str = Depends(etag_guard)
+):
+    """
+    List and search medicaments with pagination and filters.
+    
+    With `search_mode=fuzzy`, results matching `q` are returned in relevance
+    order with their score. With `fields` or `view=summary`, only the selected
+    columns are loaded and returned. With `facets`, per-value counts of
+    those columns over the whole filtered set are returned alongside the
+    page. With `as_of`, medicaments are read from the history table as they
+    were at the end of that day. Responses carry a weak ETag and
+    `If-None-Match` is answered with 304 until the data changes.
+    
+    Requires authentication (Lecteur or Admin).
+    """
+    fuzzy = search_mode == "fuzzy" and bool(filters["q"])
+    
+    if as_of is not None:
+        unsupported = [name for name, value in filters.items() if value is not None and name != "version"]
+        if unsupported or facets:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="as_of can only be combined with version, fields and view"
+            )
+    
+    facet_names = [f.strip() for f in facets.split(",") if f.strip()] if facets else []
+    unknown = [f for f in facet_names if f not in FACET_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown facets: {', '.join(unknown)}. Available: {', '.join(FACET_FIELDS)}"
+        )
+    if facet_names and fuzzy:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="facets are not available with search_mode=fuzzy"
+        )
+    
+    if as_of is not None:
+        items, total = await get_medicaments_as_of(
+            db=db,
+            as_of=as_of,
+            page=page,
+            page_size=page_size,
+            version=filters["version"]
+        )
+    elif fuzzy:
+        scored, total = await crud.search_medicaments(
+            db=db,
+            page=page,
+            page_size=page_size,
+            fields=selected,
+            **filters
+        )
+        items = [{**row, "score": score} for row, score in scored]
+    else:
+        items, total = await crud.get_medicaments(
+            db=db,
+            page=page,
+            page_size=page_size,
+            fields=selected,
+            **filters
+        )
+    
+    # Fast path: validate the whole page of rows at once and encode straight to JSON bytes
+    if selected is None:
+        schema = ScoredMedicamentOut if fuzzy else MedicamentOut
+    else:
+        schema = medicament_fields_schema(selected + ("score",) if fuzzy else selected)
+    content = {
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    }
+    if facet_names:
+        content["facets"] = await crud.get_facets(db, tuple(dict.fromkeys(facet_names)), **filters)
+    adapter = paginated_adapter(schema, bool(facet_names))
+    body = adapter.validate_python(content)
+    return Response(
+        content=adapter.dump_json(body),
+        media_type="application/json",
+        headers={"ETag": etag}
     )
 
 
-@router.get("/statistiques", response_model=MedicamentStatistics)
+@router.get("/export", dependencies=[Depends(limit_exports)])
+async def export_medicaments(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+    filters: dict = Depends(medicament_filters),
+    selected: Optional[tuple[str, ...]] = Depends(sparse_fields),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Stream every medicament matching the filters as NDJSON or CSV.
+    
+    Rows are read through a server-side cursor and encoded chunk by chunk,
+    so memory stays flat whatever the size of the export.
+    
+    Requires authentication (Lecteur or Admin).
+    """
+    fields = selected or MEDICAMENT_FIELDS
+    adapter = item_list_adapter(medicament_fields_schema(tuple(fields)))
+    
+    async def generate_ndjson():
+        async with ReadSessionLocal() as session:
+            async for rows in crud.stream_medicaments(session, fields=fields, **filters):
+                items = adapter.validate_python(rows)
+                yield "".join(item.model_dump_json() + "\n" for item in items).encode("utf-8")
+    
+    async def generate_csv():
+        yield _csv_chunk([list(fields)])
+        async with ReadSessionLocal() as session:
+            async for rows in crud.stream_medicaments(session, fields=fields, **filters):
+                items = adapter.dump_python(adapter.validate_python(rows), mode="json")
+                yield _csv_chunk([item.get(field) for field in fields] for item in items)
+    
+    if format == "csv":
+        return StreamingResponse(
+            generate_csv(),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="medicaments.csv"'}
+        )
+    return StreamingResponse(
+        generate_ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="medicaments.ndjson"'}
+    )
+
+
+@router.get("/export.parquet", dependencies=[Depends(limit_exports)])
+async def export_medicaments_parquet(
+    version: str = Query(..., description="Version of nomenclature to export"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Download a nomenclature version as a typed Parquet file.
+    
+    Dates and integers keep their types and low-cardinality columns are
+    dictionary-encoded. The file is cached on disk per version state.
+    
+    Requires authentication (Lecteur or Admin).
+    """
+    path = await get_version_parquet(db, version)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Version not found"
+        )
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename=f"medicaments-{version}.parquet"
+    )
+
+
+@router.get("/diff", dependencies=[Depends(limit_exports)])
+async def diff_medicaments(
+    from_version: str = Query(..., alias="from", description="Reference version_nomenclature"),
+    to_version: str = Query(..., alias="to", description="New version_nomenclature"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Stream the medicaments added, changed and removed between two versions.
+    
+    Medicaments are matched on `code` and compared through per-row content
+    hashes; rows sharing a code are paired (identical rows first, then in
+    id order), extra ones being reported as added or removed. The NDJSON
+    stream ends with a `summary` record holding the counts per change type.
+    
+    Requires authentication (Lecteur or Admin).
+    """
+    async def generate():
+        async with ReadSessionLocal() as session:
+            async for record in diff_versions(session, from_version, to_version):
+                yield to_json(record) + b"\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+def _csv_chunk(rows) -> bytes:
+    """Encode rows as CSV lines."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+@router.get("/statistiques", response_model=MedicamentStatistics, dependencies=[Depends(limit_reads)])
 async def get_statistics(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    _: str = Depends(etag_guard)
 ):
     """
     Get medicament statistics.
@@ -83,11 +324,107 @@ async def get_statistics(
     return MedicamentStatistics(**stats)
 
 
-@router.get("/{medicament_id}", response_model=MedicamentOut)
+@router.get("/suggest", response_model=SuggestResponse, dependencies=[Depends(limit_reads)])
+async def suggest_medicaments(
+    prefix: str = Query(..., min_length=1, description="Beginning of the value typed by the user"),
+    field: Literal["dci", "nom_marque", "laboratoire"] = Query("dci", description="Field to complete"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Autocomplete DCI, brand or laboratory names, most frequent first.
+    
+    Requires authentication (Lecteur or Admin).
+    """
+    completions = await suggest_index.suggest(db, field, prefix, limit)
+    return SuggestResponse(
+        field=field,
+        prefix=prefix,
+        suggestions=[Suggestion(value=value, count=count) for value, count in completions]
+    )
+
+
+@router.post("/lookup", response_model=MedicamentLookupResponse, dependencies=[Depends(limit_reads)])
+async def lookup_medicaments(
+    lookup: MedicamentLookupRequest,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Resolve many medicaments by id, code or num_enregistrement in one request.
+    
+    Requires authentication (Lecteur or Admin).
+    """
+    medicaments, not_found = await crud.lookup_medicaments(
+        db,
+        ids=lookup.ids,
+        codes=lookup.codes,
+        num_enregistrements=lookup.num_enregistrements,
+        version=lookup.version
+    )
+    return MedicamentLookupResponse(
+        items=medicaments,
+        not_found=LookupNotFound(**not_found)
+    )
+
+
+@router.post("/bulk", response_model=MedicamentBulkResponse)
+async def bulk_write_medicaments(
+    bulk: MedicamentBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)  # Admin only
+):
+    """
+    Apply a batch of create, update and delete operations in one transaction.
+    
+    Each operation gets its own result with the status it would have had
+    as a single request (201, 200, 204 or 404); failed operations don't
+    prevent the others from being applied.
+    
+    Requires Admin role.
+    """
+    results = await crud.bulk_write_medicaments(db, bulk.operations)
+    succeeded = Counter(result["op"] for result in results if result["status"] < 400)
+    return MedicamentBulkResponse(
+        created=succeeded["create"],
+        updated=succeeded["update"],
+        deleted=succeeded["delete"],
+        failed=sum(1 for result in results if result["status"] >= 400),
+        results=results
+    )
+
+
+@router.get("/{medicament_id}/history", response_model=list[MedicamentHistoryEntry], dependencies=[Depends(limit_reads)])
+async def get_medicament_history(
+    medicament_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    _: str = Depends(etag_guard)
+):
+    """
+    Get every recorded state of a medicament's code, oldest first.
+    
+    Entries of all versions of the code are returned, including deletions,
+    each with a full snapshot of the medicament after the write.
+    
+    Requires authentication (Lecteur or Admin).
+    """
+    history = await get_history(db, medicament_id)
+    if history is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Medicament not found"
+        )
+    return history
+
+
+@router.get("/{medicament_id}", response_model=MedicamentOut, dependencies=[Depends(limit_reads)])
 async def get_medicament(
     medicament_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    _: str = Depends(etag_guard)
 ):
     """
     Get a specific medicament by ID.
@@ -107,7 +444,7 @@ async def get_medicament(
 async def create_medicament(
     medicament: MedicamentCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin)  # Admin only
+    current_user: Principal = Depends(get_current_admin)  # Admin only
 ):
     """
     Create a new medicament.
@@ -122,7 +459,7 @@ async def update_medicament(
     medicament_id: int,
     medicament_update: MedicamentUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin)  # Admin only
+    current_user: Principal = Depends(get_current_admin)  # Admin only
 ):
     """
     Update a medicament.
@@ -142,7 +479,7 @@ async def update_medicament(
 async def delete_medicament(
     medicament_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_admin)  # Admin only
+    current_user: Principal = Depends(get_current_admin)  # Admin only
 ):
     """
     Delete a medicament (soft delete).
@@ -1,7 +1,8 @@
 """Pydantic schemas for Medicament model."""
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
 from datetime import datetime, date
-from typing import Optional, List, Generic, TypeVar
+from functools import lru_cache
+from typing import Optional, List, Generic, TypeVar, Literal, Union, Annotated
 
 
 class MedicamentBase(BaseModel):
@@ -67,6 +68,51 @@ class MedicamentOut(MedicamentBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ScoredMedicamentOut(MedicamentOut):
+    """Schema for medicament output of a ranked (fuzzy) search."""
+    score: float
+
+
+# Fields that can be requested through sparse fieldsets
+MEDICAMENT_FIELDS = tuple(MedicamentOut.model_fields)
+
+# Compact representation for table views (no large text columns)
+MEDICAMENT_SUMMARY_FIELDS = (
+    "id",
+    "code",
+    "dci",
+    "nom_marque",
+    "forme",
+    "dosage",
+    "laboratoire",
+    "type_medicament",
+    "statut",
+    "version_nomenclature",
+)
+
+
+@lru_cache(maxsize=128)
+def medicament_fields_schema(fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    Build (once per fieldset) an output schema limited to the given fields.
+    
+    Args:
+        fields: Field names of ScoredMedicamentOut (`score` only for fuzzy search)
+        
+    Returns:
+        type[BaseModel]: Schema with the same types as ScoredMedicamentOut for those fields
+    """
+    definitions = {
+        name: (ScoredMedicamentOut.model_fields[name].annotation, ScoredMedicamentOut.model_fields[name].default)
+        for name in fields
+    }
+    return create_model(
+        "MedicamentFieldsOut",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions
+    )
+
+
 T = TypeVar('T')
 
 
@@ -78,8 +124,152 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page_size: int
 
 
+class FacetedPaginatedResponse(PaginatedResponse[T], Generic[T]):
+    """Paginated response with per-value counts for the requested facets."""
+    facets: dict[str, dict[str, int]]
+
+
+# Columns that can be requested as facets
+FACET_FIELDS = (
+    "type_medicament",
+    "liste",
+    "statut",
+    "pays_laboratoire",
+    "laboratoire",
+    "version_nomenclature",
+)
+
+
+@lru_cache(maxsize=128)
+def paginated_adapter(schema: type[BaseModel], faceted: bool = False) -> TypeAdapter:
+    """
+    Cached TypeAdapter validating and serializing a whole page of `schema` items.
+    
+    Args:
+        schema: Item schema (MedicamentOut or a sparse fieldset schema)
+        faceted: Whether the page carries facet counts
+        
+    Returns:
+        TypeAdapter: Adapter for PaginatedResponse[schema] or FacetedPaginatedResponse[schema]
+    """
+    if faceted:
+        return TypeAdapter(FacetedPaginatedResponse[schema])
+    return TypeAdapter(PaginatedResponse[schema])
+
+
+@lru_cache(maxsize=128)
+def item_list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """
+    Cached TypeAdapter validating a chunk of `schema` items (used by exports).
+    
+    Args:
+        schema: Item schema
+        
+    Returns:
+        TypeAdapter: Adapter for List[schema]
+    """
+    return TypeAdapter(List[schema])
+
+
 class MedicamentStatistics(BaseModel):
     """Schema for medicament statistics."""
     par_laboratoire: dict[str, int]
     par_pays: dict[str, int]
     par_type: dict[str, int]
+
+
+class MedicamentHistoryEntry(BaseModel):
+    """Schema for one recorded state of a medicament."""
+    id: int
+    medicament_id: int
+    operation: str
+    valid_from: datetime
+    snapshot: MedicamentOut
+
+
+class Suggestion(BaseModel):
+    """Schema for a single autocomplete suggestion."""
+    value: str
+    count: int
+
+
+class SuggestResponse(BaseModel):
+    """Schema for autocomplete response."""
+    field: str
+    prefix: str
+    suggestions: List[Suggestion]
+
+
+# Maximum number of keys of each kind in a single lookup request
+MAX_LOOKUP_KEYS = 5000
+
+
+class MedicamentLookupRequest(BaseModel):
+    """Schema for resolving many medicaments in one request."""
+    ids: List[int] = Field(default_factory=list, max_length=MAX_LOOKUP_KEYS)
+    codes: List[str] = Field(default_factory=list, max_length=MAX_LOOKUP_KEYS)
+    num_enregistrements: List[str] = Field(default_factory=list, max_length=MAX_LOOKUP_KEYS)
+    version: Optional[str] = None
+
+
+class LookupNotFound(BaseModel):
+    """Keys of a lookup request that matched no medicament."""
+    ids: List[int] = []
+    codes: List[str] = []
+    num_enregistrements: List[str] = []
+
+
+class MedicamentLookupResponse(BaseModel):
+    """Schema for batch lookup response."""
+    items: List[MedicamentOut]
+    not_found: LookupNotFound
+
+
+# Maximum number of operations in a single bulk request
+MAX_BULK_OPERATIONS = 1000
+
+
+class BulkCreate(BaseModel):
+    """Bulk operation creating a medicament."""
+    op: Literal["create"]
+    data: MedicamentCreate
+
+
+class BulkUpdate(BaseModel):
+    """Bulk operation updating a medicament."""
+    op: Literal["update"]
+    id: int
+    data: MedicamentUpdate
+
+
+class BulkDelete(BaseModel):
+    """Bulk operation soft deleting a medicament."""
+    op: Literal["delete"]
+    id: int
+
+
+BulkOperation = Annotated[Union[BulkCreate, BulkUpdate, BulkDelete], Field(discriminator="op")]
+
+
+class MedicamentBulkRequest(BaseModel):
+    """Schema for a batch of writes applied in one transaction."""
+    operations: List[BulkOperation] = Field(min_length=1, max_length=MAX_BULK_OPERATIONS)
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one bulk operation, with the HTTP status it would have had alone."""
+    index: int
+    op: str
+    status: int
+    id: Optional[int] = None
+    item: Optional[MedicamentOut] = None
+    error: Optional[str] = None
+
+
+class MedicamentBulkResponse(BaseModel):
+    """Schema for bulk write response."""
+    created: int
+    updated: int
+    deleted: int
+    failed: int
+    results: List[BulkItemResult]
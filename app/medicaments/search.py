@@ -0,0 +1,222 @@
+"""Ranked fuzzy search over DCI and brand names (BM25 + bounded edit distance)."""
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.medicaments.indexing import CatalogueIndex
+from app.medicaments.models import Medicament
+from app.medicaments.suggest import normalize_term
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Weight of a term that only matches as a prefix of the query token
+PREFIX_WEIGHT = 0.7
+
+_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split a text into normalized search tokens.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List[str]: Uppercase, accent-free alphanumeric tokens
+    """
+    if not text:
+        return []
+    return _TOKEN_RE.findall(normalize_term(text))
+
+
+def max_edits(token: str) -> int:
+    """Number of typos tolerated for a query token of this length."""
+    if len(token) <= 3:
+        return 0
+    if len(token) <= 7:
+        return 1
+    return 2
+
+
+def trigrams(term: str) -> set:
+    """Padded character trigrams of a term."""
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Edit distance between two strings, abandoned as soon as it exceeds `limit`.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Maximum distance of interest
+
+    Returns:
+        Optional[int]: Distance, or None if greater than `limit`
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class _SearchData:
+    """Inverted index, trigram index and document statistics."""
+
+    def __init__(self, documents: List[Tuple[int, List[str]]]):
+        self.doc_ids: List[int] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        term_freqs: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for doc, (medicament_id, tokens) in enumerate(documents):
+            self.doc_ids.append(medicament_id)
+            self.doc_lengths.append(len(tokens))
+            for token in tokens:
+                freqs = term_freqs[token]
+                freqs[doc] = freqs.get(doc, 0) + 1
+
+        self.postings = {term: list(freqs.items()) for term, freqs in term_freqs.items()}
+        self.terms: List[str] = sorted(self.postings)
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+        self.grams: Dict[str, List[int]] = defaultdict(list)
+        for term_id, term in enumerate(self.terms):
+            for gram in trigrams(term):
+                self.grams[gram].append(term_id)
+
+    def matching_terms(self, token: str) -> Dict[str, float]:
+        """
+        Vocabulary terms matching a query token, with their match weight.
+
+        Candidates come from the trigram index (q-gram lemma), then are
+        confirmed with a bounded edit distance; prefix matches are kept
+        with a lower weight so partially typed words still rank.
+        """
+        matches: Dict[str, float] = {}
+
+        limit = max_edits(token)
+        query_grams = trigrams(token)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for term_id in self.grams.get(gram, ()):
+                shared[term_id] += 1
+        threshold = max(1, len(query_grams) - 3 * limit)
+        for term_id, count in shared.items():
+            if count < threshold:
+                continue
+            term = self.terms[term_id]
+            distance = bounded_levenshtein(token, term, limit)
+            if distance is not None:
+                matches[term] = 1.0 / (1 + distance)
+
+        if len(token) >= 3:
+            lo = bisect_left(self.terms, token)
+            hi = bisect_left(self.terms, token + "\uffff", lo)
+            for term in self.terms[lo:hi]:
+                matches.setdefault(term, PREFIX_WEIGHT)
+
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        allowed: Optional[Set[int]] = None
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Score documents against a query.
+
+        Every matching document is scored; only the best `limit` are sorted
+        and returned, along with the number of matches.
+        """
+        total_docs = len(self.doc_ids)
+        scores: Dict[int, float] = defaultdict(float)
+
+        for token in dict.fromkeys(tokenize(query)):
+            # Best contribution of this query token per document
+            token_scores: Dict[int, float] = {}
+            for term, weight in self.matching_terms(token).items():
+                postings = self.postings[term]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, tf in postings:
+                    norm = 1 - BM25_B + BM25_B * self.doc_lengths[doc] / self.avg_length
+                    score = weight * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+                    if score > token_scores.get(doc, 0.0):
+                        token_scores[doc] = score
+            for doc, score in token_scores.items():
+                scores[doc] += score
+
+        if allowed is not None:
+            scores = {doc: score for doc, score in scores.items() if self.doc_ids[doc] in allowed}
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self.doc_ids[doc], round(score, 4)) for doc, score in best], len(scores)
+
+
+class SearchIndex(CatalogueIndex):
+    """
+    Fuzzy full-text index over DCI and brand names of the active catalogue.
+
+    Built lazily on the first fuzzy query after each write.
+    """
+
+    async def _load(self, db: AsyncSession) -> _SearchData:
+        """Tokenize DCI and brand name of every active medicament."""
+        result = await db.execute(
+            select(Medicament.id, Medicament.dci, Medicament.nom_marque)
+            .where(Medicament.deleted == False)
+        )
+        documents = [
+            (medicament_id, tokenize(dci) + tokenize(nom_marque))
+            for medicament_id, dci, nom_marque in result.all()
+        ]
+        return _SearchData(documents)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        limit: int,
+        allowed: Optional[Set[int]] = None
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Rank active medicaments against a free-text query.
+
+        Args:
+            db: Database session (used only when the index must be rebuilt)
+            query: Free-text query, typos allowed
+            limit: Number of best results to return
+            allowed: Medicament ids to restrict the ranking to (None for all)
+
+        Returns:
+            Tuple[List[Tuple[int, float]], int]: Best (medicament id, score)
+            pairs, best first, and the total number of matches
+        """
+        data = await self.ensure(db)
+        return data.search(query, limit, allowed)
+
+
+search_index = SearchIndex()
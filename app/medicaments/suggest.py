@@ -0,0 +1,108 @@
+"""In-memory prefix index for medicament autocomplete."""
+import heapq
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.medicaments.indexing import CatalogueIndex
+from app.medicaments.models import Medicament
+
+# Fields that can be completed by the suggest endpoint
+SUGGEST_FIELDS = ("dci", "nom_marque", "laboratoire")
+
+
+def normalize_term(value: str) -> str:
+    """
+    Normalize a term for prefix matching (uppercase, no accents, single spaces).
+
+    Args:
+        value: Raw term
+
+    Returns:
+        str: Normalized term
+    """
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.upper().split())
+
+
+class _FieldIndex:
+    """Sorted array of distinct normalized values with their frequencies."""
+
+    def __init__(self, entries: Dict[str, Tuple[str, int]]):
+        self.keys: List[str] = sorted(entries)
+        self.labels: List[str] = [entries[key][0] for key in self.keys]
+        self.counts: List[int] = [entries[key][1] for key in self.keys]
+
+    def complete(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """Return the `limit` most frequent values starting with `prefix`."""
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\uffff", lo)
+        best = heapq.nlargest(limit, range(lo, hi), key=self.counts.__getitem__)
+        return [(self.labels[i], self.counts[i]) for i in best]
+
+
+class SuggestIndex(CatalogueIndex):
+    """
+    Autocomplete index over distinct DCI, brand and laboratory names.
+
+    The index is built lazily from the active catalogue, rebuilt eagerly at
+    the end of each import and lazily after any other write.
+    """
+
+    async def _load(self, db: AsyncSession) -> Dict[str, _FieldIndex]:
+        """Load distinct values and frequencies for every suggest field."""
+        fields = {}
+        for field in SUGGEST_FIELDS:
+            column = getattr(Medicament, field)
+            result = await db.execute(
+                select(column, func.count(Medicament.id))
+                .where(Medicament.deleted == False)
+                .group_by(column)
+            )
+
+            # Merge values that only differ by case/accents, keeping the most frequent spelling
+            entries: Dict[str, Tuple[str, int]] = {}
+            best_label: Dict[str, int] = {}
+            for value, count in result.all():
+                if not value:
+                    continue
+                key = normalize_term(value)
+                label, total = entries.get(key, (value, 0))
+                if count > best_label.get(key, 0):
+                    label = value
+                    best_label[key] = count
+                entries[key] = (label, total + count)
+            fields[field] = _FieldIndex(entries)
+        return fields
+
+    async def suggest(
+        self,
+        db: AsyncSession,
+        field: str,
+        prefix: str,
+        limit: int = 10
+    ) -> List[Tuple[str, int]]:
+        """
+        Get the most frequent completions for a prefix.
+
+        Args:
+            db: Database session (used only when the index must be rebuilt)
+            field: One of SUGGEST_FIELDS
+            prefix: Prefix typed by the user
+            limit: Maximum number of completions
+
+        Returns:
+            List[Tuple[str, int]]: (value, frequency) pairs, most frequent first
+        """
+        fields = await self.ensure(db)
+        normalized = normalize_term(prefix)
+        if not normalized:
+            return []
+        return fields[field].complete(normalized, limit)
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,15 @@
+"""DataVersion database model."""
+from sqlalchemy import Column, Integer
+from app.db.base import Base
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by every write to the nomenclature."""
+    
+    __tablename__ = "data_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        return f"<DataVersion(version={self.version})>"
@@ -0,0 +1,6 @@
+"""Test configuration: point the application at a throwaway SQLite file."""
+import os
+import tempfile
+
+# Must be set before app.core.config is imported
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
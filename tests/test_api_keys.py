@@ -0,0 +1,41 @@
+"""API key expiry normalization and caching of unknown prefixes."""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event
+
+import app.main  # noqa: F401  (registers every model on Base.metadata)
+from app.auth.api_keys import resolve_api_key
+from app.auth.schemas import ApiKeyCreate
+from app.db.base import Base
+from app.db.session import engine, AsyncSessionLocal
+
+
+def test_expires_at_is_stored_as_naive_utc():
+    assert ApiKeyCreate(name="erp", expires_at="2099-01-01T02:00:00+02:00").expires_at == datetime(2099, 1, 1)
+    assert ApiKeyCreate(name="erp", expires_at="2099-01-01T00:00:00Z").expires_at == datetime(2099, 1, 1)
+    assert ApiKeyCreate(name="erp", expires_at="2099-01-01T00:00:00").expires_at == datetime(2099, 1, 1)
+
+
+def test_unknown_prefix_is_looked_up_once():
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with AsyncSessionLocal() as db:
+                for _ in range(3):
+                    assert await resolve_api_key(db, "nmk_0123456789ab_madeupsecret") is None
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+            await engine.dispose()
+        return statements
+
+    assert len(asyncio.run(main())) == 1
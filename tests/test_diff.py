@@ -0,0 +1,69 @@
+"""Version diff with codes repeated within a version."""
+import asyncio
+
+from sqlalchemy import insert
+
+import app.main  # noqa: F401  (registers every model on Base.metadata)
+from app.db.base import Base
+from app.db.session import engine, AsyncSessionLocal
+from app.medicaments.diff import diff_versions
+from app.medicaments.models import Medicament
+
+
+def _row(id: int, code: str, version: str, dosage: str = "500MG") -> dict:
+    return dict(
+        id=id,
+        code=code,
+        dci="PARACETAMOL",
+        nom_marque="DOLIPRANE",
+        forme="CP",
+        dosage=dosage,
+        conditionnement="B/20",
+        laboratoire="SAIDAL",
+        pays_laboratoire="ALGERIE",
+        type_medicament="GE",
+        statut="F",
+        version_nomenclature=version
+    )
+
+
+def diff(rows: list) -> list:
+    """Records of the diff from V1 to V2 over the given rows."""
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Medicament), rows)
+        try:
+            async with AsyncSessionLocal() as db:
+                return [record async for record in diff_versions(db, "V1", "V2")]
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_duplicate_codes_are_paired_not_dropped():
+    records = diff([
+        _row(1, "A", "V1"),
+        _row(2, "B", "V1"),
+        _row(3, "B", "V1", dosage="1G"),
+        _row(4, "C", "V1"),
+        _row(5, "D", "V1"),
+        _row(6, "D", "V1", dosage="1G"),
+        _row(10, "A", "V2"),
+        _row(11, "B", "V2", dosage="1G"),
+        _row(12, "C", "V2", dosage="1G"),
+        _row(13, "C", "V2"),
+        _row(14, "D", "V2", dosage="2G"),
+    ])
+    changes = [(record["change"], record["code"], record.get("from_id")) for record in records[:-1]]
+    # B: id 3 is unchanged, id 2 has no counterpart; C: id 4 is unchanged, id 12 is extra;
+    # D: no identical row, id 14 replaces id 5 (first by id) and id 6 is gone
+    assert changes == [
+        ("added", "C", None),
+        ("changed", "D", 5),
+        ("removed", "B", 2),
+        ("removed", "D", 6),
+    ]
+    assert records[-1] == {"summary": {"added": 1, "changed": 1, "removed": 2, "unchanged": 3}}
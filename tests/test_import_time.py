@@ -0,0 +1,43 @@
+"""Startup import weight: heavy data libraries load only when an import or export needs them."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Imported lazily by the Excel parser and the Parquet export
+LAZY_MODULES = ("pandas", "numpy", "openpyxl", "pyarrow")
+
+# Cumulative import time of app.main (about 0.8 s when measured; pandas alone adds ~0.7 s)
+MAX_IMPORT_SECONDS = 3.0
+
+SCRIPT = f"""
+import json, os, sys
+import app.main
+print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def test_app_import_skips_heavy_modules():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True
+    )
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    cumulative = {
+        line.split("|")[2].strip(): int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[1].strip().isdigit()
+    }
+    assert cumulative["app.main"] / 1e6 < MAX_IMPORT_SECONDS
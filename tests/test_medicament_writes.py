@@ -0,0 +1,95 @@
+"""Statement counts of single-medicament writes (update and delete)."""
+import asyncio
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+import app.main  # noqa: F401  (registers every model on Base.metadata)
+from app.db.base import Base
+from app.db.session import engine, AsyncSessionLocal
+from app.medicaments import crud
+from app.medicaments.schemas import MedicamentCreate, MedicamentUpdate
+
+
+def _medicament(code: str) -> MedicamentCreate:
+    return MedicamentCreate(
+        code=code,
+        dci="PARACETAMOL",
+        nom_marque="DOLIPRANE",
+        forme="CP",
+        dosage="500MG",
+        conditionnement="B/20",
+        laboratoire="SAIDAL",
+        pays_laboratoire="ALGERIE",
+        type_medicament="GE",
+        statut="F",
+        version_nomenclature="2025-06-30"
+    )
+
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements sent to the database."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def run(test):
+    """Run a coroutine test against a fresh schema with a new medicament."""
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with AsyncSessionLocal() as db:
+                medicament = await crud.create_medicament(db, _medicament("C0001"))
+            async with AsyncSessionLocal() as db:
+                return await test(db, medicament.id)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_update_without_dimension_change():
+    async def test(db, medicament_id):
+        with count_statements() as statements:
+            row = await crud.update_medicament(db, medicament_id, MedicamentUpdate(dosage="1G"))
+        assert row["dosage"] == "1G"
+        # UPDATE ... RETURNING, history INSERT, data version UPDATE
+        assert statements == ["UPDATE", "INSERT", "UPDATE"]
+
+    run(test)
+
+
+def test_update_with_dimension_change():
+    async def test(db, medicament_id):
+        with count_statements() as statements:
+            row = await crud.update_medicament(db, medicament_id, MedicamentUpdate(laboratoire="BIOPHARM"))
+        assert row["laboratoire"] == "BIOPHARM"
+        # Old dimension values (SELECT on SQLite, same statement on PostgreSQL),
+        # UPDATE ... RETURNING, statistics upsert, history INSERT, data version UPDATE
+        assert statements == ["SELECT", "UPDATE", "INSERT", "INSERT", "UPDATE"]
+
+        stats = await crud.get_statistics.__wrapped__(db)
+        assert stats["par_laboratoire"] == {"BIOPHARM": 1}
+
+    run(test)
+
+
+def test_delete():
+    async def test(db, medicament_id):
+        with count_statements() as statements:
+            assert await crud.delete_medicament(db, medicament_id)
+        # UPDATE ... RETURNING, statistics upsert, history INSERT, data version UPDATE
+        assert statements == ["UPDATE", "INSERT", "INSERT", "UPDATE"]
+
+    run(test)
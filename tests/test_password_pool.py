@@ -0,0 +1,47 @@
+"""Reads keep being served while a login burst waits on the password hashing pool."""
+import asyncio
+import time
+
+from sqlalchemy import func, select
+
+import app.main  # noqa: F401  (registers every model on Base.metadata)
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password_async
+from app.db.base import Base
+from app.db.session import engine, AsyncSessionLocal
+from app.medicaments.models import Medicament
+
+# Logins queued per hashing thread (one bcrypt verification takes ~0.3 s)
+LOGINS_PER_WORKER = 4
+
+
+def test_read_completes_while_verifications_are_queued():
+    hashed = get_password_hash("Admin2025!")
+
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            logins = [
+                asyncio.create_task(verify_password_async("Admin2025!", hashed))
+                for _ in range(settings.PASSWORD_HASH_WORKERS * LOGINS_PER_WORKER)
+            ]
+            await asyncio.sleep(0)
+
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                assert (await db.execute(select(func.count(Medicament.id)))).scalar_one() == 0
+            read_seconds = time.perf_counter() - started
+            queued = sum(not login.done() for login in logins)
+
+            assert all(await asyncio.gather(*logins))
+            return read_seconds, queued, time.perf_counter() - started
+        finally:
+            await engine.dispose()
+
+    read_seconds, queued, burst_seconds = asyncio.run(main())
+    # The read finished while most logins were still waiting for a hashing thread,
+    # well before the burst itself
+    assert queued > settings.PASSWORD_HASH_WORKERS
+    assert read_seconds < burst_seconds / 4
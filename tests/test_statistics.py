@@ -0,0 +1,90 @@
+"""Materialized statistics on an upgraded database and on an empty catalogue."""
+import asyncio
+
+from sqlalchemy import event, insert
+
+import app.main  # noqa: F401  (registers every model on Base.metadata)
+from app.db.base import Base
+from app.db.session import engine, AsyncSessionLocal
+from app.medicaments import crud
+from app.medicaments.models import Medicament
+from app.medicaments.schemas import MedicamentCreate
+
+
+def _medicament(code: str, laboratoire: str) -> dict:
+    return dict(
+        code=code,
+        dci="PARACETAMOL",
+        nom_marque="DOLIPRANE",
+        forme="CP",
+        dosage="500MG",
+        conditionnement="B/20",
+        laboratoire=laboratoire,
+        pays_laboratoire="ALGERIE",
+        type_medicament="GE",
+        statut="F",
+        version_nomenclature="2025-06-30"
+    )
+
+
+def run(test, existing: int = 0):
+    """Run a coroutine test against a fresh schema holding `existing` rows written outside the CRUD."""
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            if existing:
+                await conn.execute(
+                    insert(Medicament),
+                    [_medicament(f"C{i:04d}", "SAIDAL") for i in range(existing)]
+                )
+        try:
+            async with AsyncSessionLocal() as db:
+                return await test(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_startup_build_before_first_write():
+    async def test(db):
+        assert await crud.ensure_statistics(db)
+        assert not await crud.ensure_statistics(db)
+        await crud.create_medicament(db, MedicamentCreate(**_medicament("NEW1", "BIOPHARM")))
+        stats = await crud.get_statistics.__wrapped__(db)
+        assert stats["par_laboratoire"] == {"SAIDAL": 50, "BIOPHARM": 1}
+
+    run(test, existing=50)
+
+
+def test_unbuilt_table_is_rebuilt_despite_deltas():
+    async def test(db):
+        # Deltas applied before any build: a create and a delete of an existing row
+        await crud.create_medicament(db, MedicamentCreate(**_medicament("NEW1", "BIOPHARM")))
+        assert await crud.delete_medicament(db, 1)
+        stats = await crud.get_statistics.__wrapped__(db)
+        assert stats["par_laboratoire"] == {"SAIDAL": 49, "BIOPHARM": 1}
+
+    run(test, existing=50)
+
+
+def test_empty_catalogue_is_built_once():
+    async def test(db):
+        assert await crud.get_statistics.__wrapped__(db) == {
+            "par_laboratoire": {}, "par_pays": {}, "par_type": {}
+        }
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split()[0].upper())
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await crud.get_statistics.__wrapped__(db)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+        assert statements == ["SELECT"]
+
+    run(test)